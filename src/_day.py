@@ -1,7 +1,8 @@
+import inputs
+
 def fetch_data(path):
-    with open(path, 'r') as f:
-        for ln in f:
-            yield ln
+    for ln in inputs.lines(path):
+        yield ln
 
 #--------------------- tests -------------------------#
 
@@ -0,0 +1,296 @@
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import namedtuple
+
+import profiling
+from generators import write_input
+from runner import SRC_DIR, load_day
+
+# `input` names the generator to use, `max_scale` caps the sizes for solvers that
+# are quadratic (or worse) so a full run still finishes in reasonable time.
+# `name` tells apart a second benchmark of the same day (it defaults to the day).
+Benchmark = namedtuple("Benchmark", "day input solve max_scale name", defaults=(None,))
+
+def name_of(benchmark):
+    return benchmark.name or benchmark.day
+
+Measurement = namedtuple("Measurement", "day scale input_bytes seconds answer sections")
+
+
+def _drop_rocks(m, path):
+    with open(path, 'r') as f:
+        rock_count = len(f.readline().rstrip()) // 5
+    chamber = m.Chamber(m.fetch_jets(path))
+    rocks = m.Rock.cycle()
+    for _ in range(rock_count):
+        chamber.drop(next(rocks))
+    return chamber.tower_height()
+
+def _play_10_rounds(m, path):
+    field = m.Field(m.fetch_data(path))
+    field.play(max_rounds=10)
+    return field.empty_ground()
+
+def _triple_trip(m, path):
+    valley = m.Valley(m.fetch_data(path))
+    trip1 = valley.shortest_path(valley.entrance, valley.exit)
+    trip2 = valley.shortest_path(valley.exit, valley.entrance, set_off_at=trip1)
+    trip3 = valley.shortest_path(valley.entrance, valley.exit, set_off_at=trip1+trip2)
+    return trip1 + trip2 + trip3
+
+def _live_filesystem(m, path):
+    live = m.LiveFilesystem()
+    live.ingest(m.fetch_data(path))
+    return live.small_dirs_total, live.smallest_dir_freeing(live.total_used_space() - 40000000)
+
+def _active_monkeys(m, path):
+    pack = m.fetch_monkeys(path)
+    m.manage_worries_for_part_2(pack)
+    return m.find_active_monkeys(pack, rounds=10000)
+
+
+BENCHMARKS = [
+    Benchmark('day01', 'day01', lambda m, path: m.get_sum_of_top_elves(m.fetch_data(path), 3), 1000),
+    Benchmark('day02', 'day02', lambda m, path: m.score_for_strategy(m.fetch_data(path)), 1000),
+    Benchmark('day02', 'day02', lambda m, path: m.score_both_parts(path), 1000, name='day02-numpy'),
+    Benchmark('day03', 'day03', lambda m, path: sum(m.priorty_of_badge(g) for g in m.fetch_groups(path)), 1000),
+    Benchmark('day03', 'day03', lambda m, path: m.sum_priorities(path), 1000, name='day03-numpy'),
+    Benchmark('day04', 'day04', lambda m, path: sum(m.has_overlap(*p) for p in m.fetch_data(path)), 1000),
+    Benchmark('day04', 'day04', lambda m, path: m.count_contained_and_overlapping(path), 1000, name='day04-numpy'),
+    Benchmark('day05', 'day05', lambda m, path: m.get_stack_tops(m.fetch_data(path), m.run_step_part_2), 100),
+    Benchmark('day06', 'day06', lambda m, path: m.chars_to_marker(m.fetch_data(path), window_size=14), 1000),
+    Benchmark('day06', 'day06', lambda m, path: m.scan_file(path, [4, 14]), 1000, name='day06-scan_file'),
+    Benchmark('day07', 'day07', lambda m, path: m.solve_part_two(m.fetch_data(path)), 100),
+    Benchmark('day07', 'day07', _live_filesystem, 1000, name='day07-live'),
+    Benchmark('day08', 'day08', lambda m, path: m.max_scenic_score(m.fetch_data(path)), 10),
+    Benchmark('day08', 'day08', lambda m, path: int(m.scenic_scores(m.fetch_data(path)).max()), 1000, name='day08-numpy'),
+    Benchmark('day09', 'day09', lambda m, path: len(m.track_visits_part_2(m.fetch_data(path), knot_count=10)), 100),
+    Benchmark('day10', 'day10', lambda m, path: list(m.draw_crt(m.fetch_data(path))), 1000),
+    Benchmark('day11', 'day11', _active_monkeys, 10),
+    Benchmark('day12', 'day12', lambda m, path: m.fetch_data(path).shortest_path(), 100),
+    Benchmark('day13', 'day13', lambda m, path: m.sum_indices_of_pairs_in_right_order(m.fetch_data(path)), 1000),
+    Benchmark('day14', 'day14', lambda m, path: m.fetch_data(path).add_sand_until_stop(), 1000),
+    Benchmark('day15', 'day15', lambda m, path: m.count_no_beacon_positions_for_row(m.fetch_data(path), 2000000), 10),
+    Benchmark('day16', 'day16', lambda m, path: m.fetch_data(path).most_pressure_in(30), 10),
+    Benchmark('day17', 'day17', _drop_rocks, 10),
+    Benchmark('day18', 'day18', lambda m, path: m.Scan(m.fetch_data(path)).exterior_surface_area(), 100),
+    Benchmark('day19', 'day19', lambda m, path: m.find_quality_levels(m.fetch_data(path)), 1),
+    Benchmark('day20', 'day20', lambda m, path: m.get_coordinates(m.decrypt_data_file(m.fetch_data(path))), 10),
+    Benchmark('day21', 'day21', lambda m, path: m.humn_needs_to_yell(m.fetch_monkeys(path)), 100),
+    Benchmark('day22-part1', 'day22', lambda m, path: m.final_password(path), 100),
+    Benchmark('day23', 'day23', _play_10_rounds, 1),
+    Benchmark('day23-faster', 'day23', _play_10_rounds, 100),
+    Benchmark('day24', 'day24', _triple_trip, 10),
+    Benchmark('day25', 'day25', lambda m, path: m.calculate_fuel(m.fetch_data(path)), 1000),
+]
+
+
+# How long a day may take to import in a fresh interpreter. Days built on numpy
+# pay for loading it; everything else should defer heavy imports (like tqdm)
+# to the code path that needs them.
+IMPORT_BUDGET = 0.05
+NUMPY_IMPORT_BUDGET = 0.3
+NUMPY_DAYS = {'day08', 'day12', 'day14', 'day17', 'day18', 'day24'}
+
+def import_budget(day):
+    return NUMPY_IMPORT_BUDGET if day in NUMPY_DAYS else IMPORT_BUDGET
+
+_COLD_IMPORT = '''
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+from runner import load_day
+before = set(sys.modules)
+start = time.perf_counter()
+load_day(sys.argv[2])
+seconds = time.perf_counter() - start
+print(json.dumps([seconds, sorted({m.split('.')[0] for m in set(sys.modules) - before})]))
+'''
+
+# Seconds to import a day in a new process (the best of `repeats` tries), and
+# the top level modules that pulled in.
+def cold_import(day, repeats=3):
+    best = math.inf
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', _COLD_IMPORT, SRC_DIR, day],
+                                capture_output=True, text=True, check=True).stdout
+        seconds, modules = json.loads(output)
+        best = min(best, seconds)
+    return best, modules
+
+
+# With profile=True, each measurement also records the day's profiling sections.
+def run_benchmark(benchmark, scales, workdir, seed=2022, profile=False):
+    # Sections are wrapped (or not) as the module loads, so switch profiling first.
+    profiling.profiler.enabled = profile
+    module = load_day(benchmark.day)
+    for scale in scales:
+        if scale > benchmark.max_scale:
+            continue
+        path = os.path.join(workdir, f'{benchmark.input}-seed{seed}-x{scale}.txt')
+        if not os.path.exists(path):
+            write_input(path, benchmark.input, scale, seed)
+        profiling.profiler.reset()
+        start = time.perf_counter()
+        answer = benchmark.solve(module, path)
+        seconds = time.perf_counter() - start
+        yield Measurement(name_of(benchmark), scale, os.path.getsize(path), seconds, repr(answer), profiling.profiler.report())
+
+
+def throughput(measurement):
+    return measurement.input_bytes / measurement.seconds if measurement.seconds else math.inf
+
+
+# Slope of log(time) against log(scale) between each pair of neighbouring sizes:
+# about 1 for a linear solver, 2 for a quadratic one.
+def scaling_exponents(measurements):
+    exponents = []
+    for small, large in zip(measurements, measurements[1:]):
+        if small.seconds > 0 and large.seconds > 0:
+            exponents.append(math.log(large.seconds / small.seconds) / math.log(large.scale / small.scale))
+    return exponents
+
+
+# Flattens a day's results into profiling-style sections (the whole solve at each
+# scale, plus any marked sections), so two benchmark runs can be diffed with profiling.compare.
+def _as_sections(day_results):
+    sections = {}
+    if day_results.get('import_seconds') is not None:
+        sections['import'] = {'calls': 1, 'seconds': day_results['import_seconds']}
+    for m in day_results['measurements']:
+        sections[f"x{m['scale']}"] = {'calls': 1, 'seconds': m['seconds']}
+        for name, stats in m['sections'].items():
+            sections[f"x{m['scale']} {name}"] = stats
+    return sections
+
+def regressions(before, after, tolerance=0.2):
+    found = []
+    for day in after:
+        if day in before:
+            for name, field, old, new in profiling.compare(_as_sections(before[day]), _as_sections(after[day]), tolerance):
+                found.append((day, name, field, old, new))
+    return found
+
+
+def report(measurements, import_seconds=None):
+    return {
+        'measurements': [m._asdict() | {'bytes_per_second': throughput(m)} for m in measurements],
+        'scaling_exponents': scaling_exponents(measurements),
+        'import_seconds': import_seconds,
+    }
+
+
+#--------------------- tests -------------------------#
+
+def test_every_generator_has_a_benchmark():
+    from generators import GENERATORS
+    assert set(GENERATORS) == {b.input for b in BENCHMARKS}
+
+def test_run_benchmark(tmp_path):
+    benchmark = next(b for b in BENCHMARKS if b.day == 'day01')
+    measurements = list(run_benchmark(benchmark, [1, 10], str(tmp_path)))
+    assert [m.scale for m in measurements] == [1, 10]
+    assert measurements[1].input_bytes > 9 * measurements[0].input_bytes
+    assert all(m.seconds > 0 for m in measurements)
+
+def test_benchmark_names_are_unique():
+    names = [name_of(b) for b in BENCHMARKS]
+    assert len(names) == len(set(names))
+
+# Streaming day 7 should keep up with building the whole tree at once. It used
+# to insert into a sorted list for every directory above each file, which
+# made it several times slower at this size and quadratic beyond it.
+def test_live_filesystem_keeps_up_with_tree(tmp_path):
+    live, tree = (next(b for b in BENCHMARKS if name_of(b) == name) for name in ('day07-live', 'day07'))
+    live_run = next(run_benchmark(live, [100], str(tmp_path)))
+    tree_run = next(run_benchmark(tree, [100], str(tmp_path)))
+    assert live_run.seconds < 4 * tree_run.seconds
+
+def test_run_benchmark_respects_max_scale(tmp_path):
+    benchmark = Benchmark('day01', 'day01', lambda m, path: None, max_scale=1)
+    assert [m.scale for m in run_benchmark(benchmark, [1, 10], str(tmp_path))] == [1]
+
+def test_run_benchmark_with_profile(tmp_path):
+    benchmark = next(b for b in BENCHMARKS if b.day == 'day23-faster')
+    measurement = next(run_benchmark(benchmark, [1], str(tmp_path), profile=True))
+    assert measurement.sections['Field.play']['calls'] == 1
+    assert measurement.sections['Elf.propose_move']['calls'] > 0
+    profiling.profiler.enabled = False
+
+def test_cold_import_defers_heavy_modules():
+    seconds, modules = cold_import('day16', repeats=1)
+    assert seconds > 0
+    assert 'cache' in modules
+    assert 'tqdm' not in modules
+    assert 'concurrent' not in cold_import('day23', repeats=1)[1]
+
+def test_import_budget():
+    assert import_budget('day01') == IMPORT_BUDGET
+    assert import_budget('day08') == NUMPY_IMPORT_BUDGET
+
+def test_scaling_exponents():
+    measurements = [
+        Measurement('day99', 1, 100, 1.0, '', {}),
+        Measurement('day99', 10, 1000, 10.0, '', {}),
+        Measurement('day99', 100, 10000, 1000.0, '', {})]
+    assert [round(e, 6) for e in scaling_exponents(measurements)] == [1, 2]
+
+def test_regressions():
+    before = {'day99': report([Measurement('day99', 1, 100, 1.0, '', {'f': {'calls': 3, 'seconds': 0.5}})])}
+    after = {'day99': report([Measurement('day99', 1, 100, 2.0, '', {'f': {'calls': 4, 'seconds': 0.5}})])}
+    assert regressions(before, after) == [('day99', 'x1', 'seconds', 1.0, 2.0), ('day99', 'x1 f', 'calls', 3, 4)]
+    before['day99']['import_seconds'] = 0.01
+    after['day99']['import_seconds'] = 0.02
+    assert regressions(before, after)[0] == ('day99', 'import', 'seconds', 0.01, 0.02)
+
+#-----------------------------------------------------#
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark each day solver on generated inputs of increasing size.')
+    parser.add_argument('days', nargs='*', help='Only benchmark these days, e.g. day01 day23-faster')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100, 1000])
+    parser.add_argument('--seed', type=int, default=2022)
+    parser.add_argument('--workdir', help='Where to keep generated inputs (reused between runs)')
+    parser.add_argument('--json', help='Write all results to this file')
+    parser.add_argument('--profile', action='store_true', help="Record the days' profiling sections too")
+    parser.add_argument('--compare', help='Report regressions against the results in this earlier --json file')
+    parser.add_argument('--skip-imports', action='store_true', help="Don't time each day's cold import")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='aoc-bench-')
+    os.makedirs(workdir, exist_ok=True)
+
+    results = {}
+    for benchmark in BENCHMARKS:
+        if args.days and name_of(benchmark) not in args.days:
+            continue
+        measurements = []
+        for m in run_benchmark(benchmark, args.scales, workdir, args.seed, args.profile):
+            print(f'{m.day:<14} x{m.scale:<5} {m.input_bytes:>11} bytes  {m.seconds:9.3f}s  '
+                  f'{throughput(m) / 1e6:9.2f} MB/s')
+            measurements.append(m)
+        exponents = scaling_exponents(measurements)
+        if exponents:
+            print(f'{name_of(benchmark):<14} scaling exponents: {", ".join(f"{e:.2f}" for e in exponents)}')
+        import_seconds = None
+        if not args.skip_imports:
+            import_seconds, modules = cold_import(benchmark.day)
+            budget = import_budget(benchmark.day)
+            status = 'ok' if import_seconds <= budget else 'OVER BUDGET'
+            print(f'{name_of(benchmark):<14} import {import_seconds:.3f}s (budget {budget:.3f}s) {status}')
+        results[name_of(benchmark)] = report(measurements, import_seconds)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        for day, name, field, old, new in regressions(baseline, results):
+            print(f'REGRESSION {day} {name}: {field} went from {old} to {new}')
@@ -0,0 +1,207 @@
+# On-disk cache for solver results. A result is keyed by the day, the function,
+# its parameters, the hash of the input file and the hash of the day's source
+# (and of the local modules it uses, like search.py), so changing the input or
+# the code gives a fresh key and never a stale answer.
+
+import functools
+import hashlib
+import os
+import pickle
+import sys
+import types
+
+import inputs
+
+CACHE_DIR = os.environ.get('AOC_CACHE_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache'))
+MAX_BYTES = 64 * 1024 * 1024
+
+
+def file_hash(path):
+    with inputs.mapped(path) as mm:
+        return hashlib.sha256(mm).hexdigest()
+
+
+# The source files for fn's module and every module beside it that it uses,
+# directly or through another of them, sorted. A module counts as used if it,
+# or a function or class from it, is one of the module's globals.
+def local_sources(fn):
+    source = os.path.abspath(fn.__code__.co_filename)
+    directory = os.path.dirname(source)
+    found = {source}
+    namespaces = [fn.__globals__]
+    while namespaces:
+        for value in namespaces.pop().values():
+            module = value if isinstance(value, types.ModuleType) else sys.modules.get(getattr(value, '__module__', None) or '')
+            path = getattr(module, '__file__', None)
+            if path is None:
+                continue
+            path = os.path.abspath(path)
+            if os.path.dirname(path) == directory and path not in found:
+                found.add(path)
+                namespaces.append(vars(module))
+    return sorted(found)
+
+
+class ResultCache:
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key(self, fn, path, args, kwargs):
+        source = fn.__code__.co_filename
+        day = os.path.splitext(os.path.basename(source))[0]
+        h = hashlib.sha256()
+        parts = [day, fn.__qualname__, repr(args), repr(sorted(kwargs.items())), file_hash(path)]
+        parts += [file_hash(p) for p in local_sources(fn)]
+        for part in parts:
+            h.update(part.encode())
+            h.update(b'\0')
+        return f'{day}-{h.hexdigest()}'
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.pickle')
+
+    # Returns (found, value). A hit counts as a use for the LRU eviction.
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return False, None
+        os.utime(self._path(key))
+        return True, value
+
+    def put(self, key, value):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f'{self._path(key)}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(value, f)
+        os.replace(tmp, self._path(key))
+        self.evict()
+
+    def _entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for filename in os.listdir(self.directory):
+            if filename.endswith('.pickle'):
+                path = os.path.join(self.directory, filename)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    # Drops least recently used entries until the cache fits in max_bytes.
+    def evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    # Removes every entry, or just the ones for the named days.
+    def clear(self, days=None):
+        removed = 0
+        for _, _, path in self._entries():
+            day = os.path.basename(path).rsplit('-', 1)[0]
+            if days is None or day in days:
+                os.remove(path)
+                removed += 1
+        return removed
+
+    # For solver functions whose first argument is the input file's path.
+    def keyed_on_input(self, fn):
+        @functools.wraps(fn)
+        def wrapper(path, *args, **kwargs):
+            key = self.key(fn, path, args, kwargs)
+            found, value = self.get(key)
+            if not found:
+                value = fn(path, *args, **kwargs)
+                self.put(key, value)
+            return value
+        return wrapper
+
+
+default_cache = ResultCache()
+keyed_on_input = default_cache.keyed_on_input
+
+
+#--------------------- tests -------------------------#
+
+def test_cache_hit_skips_work(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    calls = []
+
+    @cache.keyed_on_input
+    def count_lines(path, extra):
+        calls.append(path)
+        return len(list(inputs.lines(path))) + extra
+
+    assert count_lines('sample_data/day09.txt', 1) == 9
+    assert count_lines('sample_data/day09.txt', 1) == 9
+    assert len(calls) == 1
+    assert count_lines('sample_data/day09.txt', 2) == 10
+    assert len(calls) == 2
+
+def test_changed_input_changes_key(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    data = tmp_path / 'input.txt'
+    data.write_text('1\n')
+    first = cache.key(file_hash, str(data), (), {})
+    data.write_text('2\n')
+    assert cache.key(file_hash, str(data), (), {}) != first
+    assert first.startswith('cache-')
+
+def test_changed_dependency_changes_key(tmp_path):
+    import importlib.util
+    (tmp_path / 'helper.py').write_text('def double(x):\n    return 2 * x\n')
+    (tmp_path / 'day99.py').write_text('from helper import double\ndef solve(path):\n    return double(1)\n')
+    sys.path.insert(0, str(tmp_path))
+    try:
+        spec = importlib.util.spec_from_file_location('day99', tmp_path / 'day99.py')
+        day = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(day)
+        assert local_sources(day.solve) == [str(tmp_path / 'day99.py'), str(tmp_path / 'helper.py')]
+
+        cache = ResultCache(str(tmp_path / 'cache'))
+        first = cache.key(day.solve, str(tmp_path / 'day99.py'), (), {})
+        (tmp_path / 'helper.py').write_text('def double(x):\n    return x + x\n')
+        assert cache.key(day.solve, str(tmp_path / 'day99.py'), (), {}) != first
+    finally:
+        sys.path.remove(str(tmp_path))
+        sys.modules.pop('helper', None)
+
+def test_day_key_covers_search():
+    import day24
+    assert os.path.join(os.path.dirname(os.path.abspath(__file__)), 'search.py') in local_sources(day24.triple_trip.__wrapped__)
+
+def test_eviction_keeps_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'), max_bytes=0)
+    cache.put('day01-a', 'x' * 100)
+    assert cache.get('day01-a') == (False, None)
+
+    cache.max_bytes = 300
+    cache.put('day01-a', 'x' * 100)
+    cache.put('day01-b', 'x' * 100)
+    os.utime(cache._path('day01-a'), (0, 0))
+    cache.put('day01-c', 'x' * 100)
+    assert cache.get('day01-a') == (False, None)
+    assert cache.get('day01-c') == (True, 'x' * 100)
+
+def test_clear(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    cache.put('day16-a', 1)
+    cache.put('day22-part2-b', 2)
+    assert cache.clear(['day22-part2']) == 1
+    assert cache.get('day16-a') == (True, 1)
+    assert cache.clear() == 1
+
+#-----------------------------------------------------#
+
+if __name__ == "__main__":
+    # python src/cache.py clear [day16 day24 ...]
+    if sys.argv[1:2] != ['clear']:
+        sys.exit('Usage: cache.py clear [day ...]')
+    removed = default_cache.clear(sys.argv[2:] or None)
+    print(f'Removed {removed} cached results from {default_cache.directory}')
@@ -0,0 +1,112 @@
+# Finding where a simulation starts repeating itself, so that asking for the
+# state after a huge number of steps (a trillion rocks, say) only needs the
+# steps up to the first repeat plus some arithmetic.
+#
+# CycleDetector is fed one step at a time: a fingerprint of the state that
+# decides what happens next, and the running total you want to extrapolate.
+# brent() is for a pure `step(state) -> state` function, and keeps no history.
+
+from collections import namedtuple
+
+# The state after `start` steps is seen again after `start + length` steps.
+Cycle = namedtuple("Cycle", "start length")
+
+
+class CycleDetector:
+    def __init__(self, fingerprint=lambda state: state):
+        self.fingerprint = fingerprint
+        self.first_seen = {}
+        self.values = []
+        self.cycle = None
+
+    # Records the state and value after the next step (the first call is step 0).
+    # Returns the Cycle once a state repeats, and None until then.
+    def add(self, state, value):
+        if self.cycle is not None:
+            return self.cycle
+        key = self.fingerprint(state)
+        step = len(self.values)
+        self.values.append(value)
+        if key in self.first_seen:
+            start = self.first_seen[key]
+            self.cycle = Cycle(start, step - start)
+        else:
+            self.first_seen[key] = step
+        return self.cycle
+
+    # The value after n steps: looked up if we've been there, otherwise
+    # the gain over each full cycle is added on.
+    def value_at(self, n):
+        if n < len(self.values):
+            return self.values[n]
+        if self.cycle is None:
+            raise ValueError(f'No cycle found yet, only seen {len(self.values)} steps')
+        start, length = self.cycle
+        full_cycles, into_cycle = divmod(n - start, length)
+        gain = self.values[start + length] - self.values[start]
+        return self.values[start + into_cycle] + full_cycles * gain
+
+
+# Brent's algorithm: finds the cycle in x0, step(x0), step(step(x0)), ...
+# with only a couple of states held at once. The states must be comparable
+# with ==, or give `fingerprint` to compare something smaller.
+def brent(step, x0, fingerprint=lambda state: state):
+    power = length = 1
+    tortoise, hare = x0, step(x0)
+    while fingerprint(tortoise) != fingerprint(hare):
+        if power == length:
+            tortoise = hare
+            power *= 2
+            length = 0
+        hare = step(hare)
+        length += 1
+
+    tortoise = hare = x0
+    for _ in range(length):
+        hare = step(hare)
+    start = 0
+    while fingerprint(tortoise) != fingerprint(hare):
+        tortoise = step(tortoise)
+        hare = step(hare)
+        start += 1
+    return Cycle(start, length)
+
+
+#--------------------- tests -------------------------#
+
+def test_detector_extrapolates():
+    # Values climb by 1 for 3 steps, then repeat +2, +5, +1 forever.
+    gains = [1, 1, 1] + [2, 5, 1] * 10
+    detector = CycleDetector(fingerprint=lambda i: i if i < 3 else 3 + (i - 3) % 3)
+    total = 0
+    for i, gain in enumerate(gains):
+        if detector.add(i, total):
+            break
+        total += gain
+    assert detector.cycle == Cycle(3, 3)
+    expected = [0]
+    for gain in gains:
+        expected.append(expected[-1] + gain)
+    assert [detector.value_at(n) for n in range(len(expected))] == expected
+    assert detector.value_at(3 + 3 * 10**12) == 3 + 8 * 10**12
+
+def test_value_at_without_cycle():
+    detector = CycleDetector()
+    detector.add('a', 1)
+    assert detector.value_at(0) == 1
+    try:
+        detector.value_at(5)
+        assert False
+    except ValueError:
+        pass
+
+def test_brent():
+    step = lambda x: (x * x + 1) % 255
+    seen = []
+    x = 3
+    while x not in seen:
+        seen.append(x)
+        x = step(x)
+    assert brent(step, 3) == Cycle(seen.index(x), len(seen) - seen.index(x))
+
+#-----------------------------------------------------#
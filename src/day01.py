@@ -1,16 +1,61 @@
+import heapq
+import os
+from functools import partial
+import inputs
+
 def fetch_data(path):
-    with open(path, 'r') as f:
-        accumulator = 0
-        for ln in f:
-            if len(ln.rstrip()):
-                accumulator += int(ln)
-            else:
-                yield accumulator
-                accumulator = 0
-        yield accumulator
+    for elf in inputs.records(path):
+        yield sum(map(int, elf.split()))
+
+# Every elf's total at once, as a numpy array, without a Python loop over the
+# lines: the numbers come from inputs.digit_runs, and a new group starts
+# wherever there's more than one line break between two of them.
+def fetch_group_sums(path):
+    import numpy as np
+    buf = inputs.byte_array(path)
+    starts, ends, numbers = inputs.digit_runs(buf)
+    if not numbers.size:
+        return np.zeros(0, np.int64)
+    line_breaks = np.flatnonzero(buf == ord('\n'))
+    breaks_between = np.searchsorted(line_breaks, starts[1:]) - np.searchsorted(line_breaks, ends[:-1])
+    group_starts = np.concatenate(([0], np.flatnonzero(breaks_between > 1) + 1))
+    return np.add.reduceat(numbers, group_starts)
 
+# Only keeps the top n as it goes, so data can be a stream of any length.
+# A numpy array from fetch_group_sums is partitioned instead.
 def get_sum_of_top_elves(data, n):
-    return sum(sorted(data)[-n:])
+    if hasattr(data, 'partition'):
+        n = min(n, len(data))
+        if n <= 0:
+            return 0
+        top = data.copy()
+        top.partition(len(top) - n)
+        return int(top[-n:].sum())
+    return sum(heapq.nlargest(n, data))
+
+def _top_elves_in_file(path, n):
+    return heapq.nlargest(n, fetch_data(path))
+
+# For inventories split over many files (or every file in a directory, or just
+# one file): each worker process finds the top n in its own files, and only
+# those n per file come back to be merged. The overall top n must be in some
+# file's top n.
+def get_sum_of_top_elves_in_files(paths, n, workers=None):
+    if isinstance(paths, (str, os.PathLike)):
+        if os.path.isdir(paths):
+            paths = sorted(os.path.join(paths, f) for f in os.listdir(paths) if os.path.isfile(os.path.join(paths, f)))
+        else:
+            paths = [paths]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    top_in_each = partial(_top_elves_in_file, n=n)
+    if workers == 1 or len(paths) <= 1:
+        partials = list(map(top_in_each, paths))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            partials = list(pool.map(top_in_each, paths))
+    return get_sum_of_top_elves((c for p in partials for c in p), n)
 
 #--------------------- tests -------------------------#
 
@@ -22,6 +67,38 @@ def test_get_sum_of_top_elves():
     data = fetch_data('sample_data/day01.txt')
     assert get_sum_of_top_elves(data, 3) == 45000
 
+def test_fetch_group_sums():
+    sums = fetch_group_sums('sample_data/day01.txt')
+    assert sums.tolist() == [6000, 4000, 11000, 24000, 10000]
+    assert get_sum_of_top_elves(sums, 3) == 45000
+    assert get_sum_of_top_elves(sums, 10) == 55000
+
+def test_streaming_and_numpy_agree_on_crlf(tmp_path):
+    path = tmp_path / 'elves.txt'
+    path.write_bytes(b'\r\n12\r\n3\r\n\r\n\r\n123456789012\r\n7\r\n \r\n40\r\n')
+    assert list(fetch_data(path)) == fetch_group_sums(path).tolist() == [15, 123456789019, 40]
+
+def test_get_sum_of_top_elves_in_files(tmp_path):
+    shards = tmp_path / 'shards'
+    shards.mkdir()
+    records = open('sample_data/day01.txt').read().split('\n\n')
+    for i, record in enumerate(records):
+        (shards / f'{i}.txt').write_text(record)
+    assert get_sum_of_top_elves_in_files(str(shards), 3) == 45000
+    assert get_sum_of_top_elves_in_files(str(shards), 3, workers=1) == 45000
+    assert get_sum_of_top_elves_in_files(sorted(str(p) for p in shards.iterdir())[:2], 1, workers=2) == 6000
+    assert get_sum_of_top_elves_in_files('sample_data/day01.txt', 3) == 45000
+
+def test_get_sum_of_top_elves_in_crlf_files(tmp_path):
+    records = open('sample_data/day01.txt').read().strip().split('\n\n')
+    for i, shard in enumerate((records[:3], records[3:])):
+        (tmp_path / f'{i}.txt').write_bytes('\r\n\r\n'.join(shard).replace('\n', '\r\n').encode() + b'\r\n')
+    import numpy as np
+    sums = np.concatenate([fetch_group_sums(tmp_path / f'{i}.txt') for i in range(2)])
+    assert sums.tolist() == [6000, 4000, 11000, 24000, 10000]
+    for n in (1, 3, 5):
+        assert get_sum_of_top_elves_in_files(str(tmp_path), n, workers=1) == get_sum_of_top_elves(sums, n)
+
 
 #-----------------------------------------------------#
 
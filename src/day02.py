@@ -1,3 +1,4 @@
+import inputs
 
 translate = { 
     'A': 'Rock', 'B': 'Paper', 'C': 'Scissors',
@@ -32,6 +33,33 @@ def score_for_strategy(data):
     return sum(score_for_round(*r) for r in data)
 
 
+# Part 1 read the second column as what to play: X, Y, Z for Rock, Paper, Scissors.
+def score_for_play(their_play, my_play):
+    if my_play == their_play:
+        score = 3
+    elif loses_to[my_play] == their_play:
+        score = 6
+    else:
+        score = 0
+    return score + points_for[my_play]
+
+# Score for each of the 9 possible rounds, indexed by 3*(their column) + (my column).
+score_table_part_1 = [score_for_play(translate[a], play) for a in 'ABC' for play in ('Rock', 'Paper', 'Scissors')]
+score_table_part_2 = [score_for_round(translate[a], translate[x]) for a in 'ABC' for x in 'XYZ']
+
+# Both parts' totals from one pass over the raw bytes. A-C and X-Z never
+# clash with each other (or with spaces and line endings), so picking them out
+# of the whole file gives their column and my column, in order. Then it's a
+# count of each kind of round against the tables.
+def score_both_parts(path):
+    import numpy as np
+    buf = inputs.byte_array(path)
+    theirs = buf[(buf >= ord('A')) & (buf <= ord('C'))] - ord('A')
+    mine = buf[(buf >= ord('X')) & (buf <= ord('Z'))] - ord('X')
+    rounds = np.bincount(theirs.astype(np.intp) * 3 + mine, minlength=9)
+    return int(rounds @ score_table_part_1), int(rounds @ score_table_part_2)
+
+
 #--------------------- tests -------------------------#
 
 def test_score_for_round():
@@ -43,8 +71,28 @@ def test_score_for_strategy():
     data = fetch_data('sample_data/day02.txt')
     assert score_for_strategy(data) == 12
 
+def test_score_tables():
+    assert score_table_part_1[0*3 + 1] == 8
+    assert score_table_part_1[1*3 + 0] == 1
+    assert score_table_part_1[2*3 + 2] == 6
+    assert score_table_part_2[0*3 + 1] == 4
+
+def test_score_both_parts():
+    assert score_both_parts('sample_data/day02.txt') == (15, 12)
+
+def test_streaming_and_numpy_agree_on_crlf(tmp_path):
+    import random
+    rng = random.Random(2)
+    rounds = [(rng.choice('ABC'), rng.choice('XYZ')) for _ in range(200)]
+    path = tmp_path / 'guide.txt'
+    path.write_bytes(b''.join(f'{a} {x}\r\n'.encode() for a, x in rounds))
+    plays = {'X': 'Rock', 'Y': 'Paper', 'Z': 'Scissors'}
+    part_1 = sum(score_for_play(translate[a], plays[x]) for a, x in rounds)
+    assert score_both_parts(path) == (part_1, score_for_strategy(fetch_data(path)))
+
 #-----------------------------------------------------#
 
 if __name__ == "__main__":
-    data = fetch_data('data/day02.txt')
-    print(score_for_strategy(data))
+    part_1, part_2 = score_both_parts('data/day02.txt')
+    print(part_1)
+    print(part_2)
@@ -1,4 +1,4 @@
-import functools
+import inputs
 
 
 def fetch_data(path):
@@ -13,10 +13,28 @@ def priority(item):
         return ord(item) - 38
 
 
+# Item sets as bitmasks, where an item's bit is its priority: intersection is
+# then `&`, and a single common item's priority is its bit's position.
+# Items can be str characters or bytes values.
+letters = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+item_bits = {c: 1 << priority(c) for c in letters} | {ord(c): 1 << priority(c) for c in letters}
+
+def items_mask(items):
+    # Each distinct item has its own bit, so adding them up is the same as or-ing them.
+    return sum(map(item_bits.__getitem__, set(items)))
+
+def priority_of_mask(mask):
+    total = 0
+    while mask:
+        lowest = mask & -mask
+        total += lowest.bit_length() - 1
+        mask ^= lowest
+    return total
+
+
 def priority_of_common_items(rucksack):
     halfway = len(rucksack) // 2
-    common_items = set(rucksack[:halfway]).intersection(rucksack[halfway:])
-    return sum(priority(c) for c in common_items)
+    return priority_of_mask(items_mask(rucksack[:halfway]) & items_mask(rucksack[halfway:]))
 
 
 def fetch_groups(path):
@@ -28,8 +46,41 @@ def fetch_groups(path):
             return
 
 def priorty_of_badge(group):
-    badges = functools.reduce(set.intersection, (set(rucksack) for rucksack in group))
-    return sum(priority(b) for b in badges)
+    badges = -1
+    for rucksack in group:
+        badges &= items_mask(rucksack)
+    return priority_of_mask(badges)
+
+
+# Both parts for a whole file at once: (sum of common item priorities, sum of
+# badge priorities). Every byte becomes its item's bit in a numpy uint64 array,
+# then each half rucksack is or-ed together with reduceat, so the set work
+# happens on every rucksack at once rather than one at a time.
+def sum_priorities(path):
+    import numpy as np
+    buf = inputs.byte_array(path)
+    bits = np.zeros(256, np.uint64)
+    for c in letters:
+        bits[ord(c)] = 1 << priority(c)
+    if not buf.size:
+        return 0, 0
+
+    is_item = bits[buf] != 0
+    # Where each rucksack's items start and stop (line endings aren't items).
+    edges = np.flatnonzero(np.diff(is_item.astype(np.int8), prepend=0, append=0))
+    starts, ends = edges[0::2], edges[1::2]
+    halfway = starts + (ends - starts) // 2
+    halves = np.bitwise_or.reduceat(bits[buf], np.stack([starts, halfway], axis=1).ravel())
+    first, second = halves[0::2], halves[1::2]
+    # The second half's reduceat runs on to the next rucksack's start; the
+    # bytes in between are line endings with no bits, so that's harmless.
+
+    def total_priority(masks):
+        return sum(k * int(((masks >> np.uint64(k)) & np.uint64(1)).sum()) for k in range(1, 53))
+
+    groups = (first | second)[:len(first) // 3 * 3].reshape(-1, 3)
+    return total_priority(first & second), total_priority(np.bitwise_and.reduce(groups, axis=1))
+
 
 #--------------------- tests -------------------------#
 
@@ -65,6 +116,22 @@ def test_sum_priorities_for_badges():
     groups = fetch_groups('sample_data/day03.txt')
     assert sum(priorty_of_badge(g) for g in groups) == 70
 
+def test_items_mask():
+    assert items_mask('aab') == 0b110
+    assert items_mask(b'aZ') == items_mask('aZ') == (1 << 1) | (1 << 52)
+    assert priority_of_mask(items_mask('pL')) == 16 + 38
+    assert priority_of_mask(0) == 0
+
+def test_sum_priorities():
+    assert sum_priorities('sample_data/day03.txt') == (157, 70)
+
+def test_streaming_and_numpy_agree_on_crlf(tmp_path):
+    path = tmp_path / 'rucksacks.txt'
+    path.write_bytes(open('sample_data/day03.txt', 'rb').read().replace(b'\r\n', b'\n').replace(b'\n', b'\r\n'))
+    common = sum(priority_of_common_items(r) for r in fetch_data(path))
+    badges = sum(priorty_of_badge(g) for g in fetch_groups(path))
+    assert sum_priorities(path) == (common, badges) == (157, 70)
+
 #-----------------------------------------------------#
 
 if __name__ == "__main__":
@@ -1,21 +1,40 @@
-import re
+import inputs
+import intervals
 
 def fetch_data(path):
-    with open(path, 'r') as f:
-        for ln in f:
-            yield [int(n) for n in re.findall(r'\d+', ln)]
+    for ln in inputs.lines(path):
+        yield inputs.ints_in(ln)
 
 def is_contained(first_min, first_max, second_min, second_max):
-    return ((first_min <= second_min and second_max <= first_max)
-         or (second_min <= first_min and first_max <= second_max))
+    return (intervals.contains(first_min, first_max, second_min, second_max)
+         or intervals.contains(second_min, second_max, first_min, first_max))
 
 def has_partial_overlap(first_min, first_max, second_min, second_max):
     return ((first_min <= second_min <= first_max)
          or (first_min <= second_max <= first_max))
 
 def has_overlap(first_min, first_max, second_min, second_max):
-    return (is_contained(first_min, first_max, second_min, second_max) 
-         or has_partial_overlap(first_min, first_max, second_min, second_max))
+    return intervals.overlaps(first_min, first_max, second_min, second_max)
+
+
+# Every assignment in the file (two per line), indexed so we can ask which of
+# them overlap a range, or how many pairs of them overlap, without comparing
+# every assignment with every other.
+def index_assignments(data):
+    ranges = []
+    for first_min, first_max, second_min, second_max in data:
+        ranges += [(first_min, first_max), (second_min, second_max)]
+    return intervals.RangeIndex(ranges)
+
+
+# The per-line counts for the whole file at once: (lines where one range
+# contains the other, lines where they overlap).
+def count_contained_and_overlapping(path):
+    first_min, first_max, second_min, second_max = inputs.int_array(path).reshape(-1, 4).T
+    contained = (((first_min <= second_min) & (second_max <= first_max))
+               | ((second_min <= first_min) & (first_max <= second_max)))
+    overlapping = (first_min <= second_max) & (second_min <= first_max)
+    return int(contained.sum()), int(overlapping.sum())
 
 #--------------------- tests -------------------------#
 
@@ -44,6 +63,17 @@ def test_count_overlapping_pairs():
     data = fetch_data('sample_data/day04.txt')
     assert sum(has_overlap(*p) for p in data) == 4
 
+def test_count_contained_and_overlapping():
+    assert count_contained_and_overlapping('sample_data/day04.txt') == (2, 4)
+
+def test_index_assignments():
+    index = index_assignments(fetch_data('sample_data/day04.txt'))
+    assert len(index) == 12
+    assert sorted(index.ranges[i] for i in index.overlapping(4, 4)) == [(2, 4), (2, 6), (2, 8), (3, 7), (4, 5), (4, 6), (4, 8)]
+    ranges = index.ranges
+    assert index.count_overlapping_pairs() == sum(
+        has_overlap(*ranges[i], *ranges[j]) for i in range(len(ranges)) for j in range(i + 1, len(ranges)))
+
 #-----------------------------------------------------#
 
 if __name__ == "__main__":
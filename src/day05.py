@@ -1,4 +1,5 @@
-from collections import defaultdict, deque
+from array import array
+from collections import defaultdict
 import re
 
 def fetch_data(path):
@@ -10,14 +11,18 @@ def get_cols_and_labels(ln):
     return [(m.start(), m.group()) for m in re.finditer(r'\w', ln)]
 
 # Advances 'data' past the stack setup, leaves it ready to run steps.
+# Each stack is a list from bottom to top.
 def get_starting_stacks(data):
-    starting_stacks = defaultdict(deque)
+    starting_stacks = defaultdict(list)
     while True:
         ln = next(data)
         if ln.lstrip()[0] == '[':
             for col, crate in get_cols_and_labels(ln):
-                starting_stacks[col].appendleft(crate)
+                starting_stacks[col].append(crate)
         else:
+            # Crates were read top down.
+            for stack in starting_stacks.values():
+                stack.reverse()
             # We're at the stack names. Use these instead of col positons as dict keys.
             for col, stack_name in get_cols_and_labels(ln):
                 starting_stacks[stack_name] = starting_stacks[col]
@@ -28,26 +33,93 @@ def get_starting_stacks(data):
             return starting_stacks
 
 
+# Lifts the top num_crates off one stack as a single slice. The CrateMover 9000
+# moves them one at a time, so they land in reverse order; the 9001 keeps them in order.
+def move_crates(stacks, num_crates, from_stack, to_stack, keep_order):
+    source = stacks[from_stack]
+    if num_crates > len(source):
+        raise IndexError(f'Can only move {len(source)} crates from stack {from_stack}, not {num_crates}')
+    moving = source[len(source)-num_crates:]
+    del source[len(source)-num_crates:]
+    if not keep_order:
+        moving.reverse()
+    stacks[to_stack] += moving
+
+
 def run_step(ln, stacks):
     num_crates, from_stack, to_stack = re.match(r'move (\d+) from (\d+) to (\d+)', ln).groups()
-    for _ in range(int(num_crates)):
-        stacks[to_stack].append(stacks[from_stack].pop())
+    move_crates(stacks, int(num_crates), from_stack, to_stack, keep_order=False)
 
 
 def run_step_part_2(ln, stacks):
     num_crates, from_stack, to_stack = re.match(r'move (\d+) from (\d+) to (\d+)', ln).groups()
-    mover = deque()
-    for _ in range(int(num_crates)):
-        mover.append(stacks[from_stack].pop())
-    for _ in range(int(num_crates)):
-        stacks[to_stack].append(mover.pop())
-
-
-def get_stack_tops(data, mover_fn=run_step):
+    move_crates(stacks, int(num_crates), from_stack, to_stack, keep_order=True)
+
+
+# The rest of 'data' (the steps) parsed in one go into a flat array of
+# count, from, to triples, with stacks given by their position in stack_names.
+def decode_steps(data, stack_names):
+    position = {int(name): i for i, name in enumerate(stack_names)}
+    steps = array('l', map(int, re.findall(r'\d+', ''.join(data))))
+    for field in (1, 2):
+        steps[field::3] = array('l', map(position.__getitem__, steps[field::3]))
+    return steps
+
+
+# Runs decoded steps on a list of stacks.
+def run_steps(steps, stacks, keep_order):
+    moves = iter(steps)
+    for num_crates, from_stack, to_stack in zip(moves, moves, moves):
+        move_crates(stacks, num_crates, from_stack, to_stack, keep_order)
+
+
+# The crate on top of each stack at the end, found without moving any crates:
+# each top position is followed backwards through the steps to where that
+# crate started. Costs the same however many crates each step moves.
+# Stacks that end up empty are left out.
+def trace_stack_tops(steps, stacks, keep_order):
+    heights = [len(stack) for stack in stacks]
+    moves = iter(steps)
+    for num_crates, from_stack, to_stack in zip(moves, moves, moves):
+        heights[from_stack] -= num_crates
+        heights[to_stack] += num_crates
+
+    # (stack, how far down from the top) for each crate we're following.
+    positions = [[stack, 0] for stack, height in enumerate(heights) if height]
+    for i in range(len(steps) - 3, -1, -3):
+        num_crates, from_stack, to_stack = steps[i], steps[i+1], steps[i+2]
+        for position in positions:
+            stack, depth = position
+            if stack == to_stack:
+                if depth < num_crates:
+                    position[0] = from_stack
+                    position[1] = depth if keep_order else num_crates - 1 - depth
+                else:
+                    position[1] = depth - num_crates
+            elif stack == from_stack:
+                position[1] = depth + num_crates
+    return ''.join(stacks[stack][-1 - depth] for stack, depth in positions)
+
+
+# Which CrateMover each step function is, so the known ones can run on decoded steps.
+keeps_order = {run_step: False, run_step_part_2: True}
+
+# With replay_backwards, the tops are traced back through the steps rather
+# than found by moving the crates (only for run_step and run_step_part_2).
+def get_stack_tops(data, mover_fn=run_step, replay_backwards=False):
     stacks = get_starting_stacks(data)
 
-    for step in data:
-        mover_fn(step, stacks)
+    if replay_backwards:
+        if mover_fn not in keeps_order:
+            raise ValueError('Can only replay backwards with run_step or run_step_part_2')
+        names = list(stacks)
+        return trace_stack_tops(decode_steps(data, names), [stacks[name] for name in names], keeps_order[mover_fn])
+    elif mover_fn in keeps_order:
+        names = list(stacks)
+        run_steps(decode_steps(data, names), [stacks[name] for name in names], keeps_order[mover_fn])
+    else:
+        for step in data:
+            mover_fn(step, stacks)
 
     return ''.join(stack.pop() for stack in stacks.values()) 
 
@@ -74,6 +146,62 @@ def test_run_step():
     assert list(stacks['2']) == ['M', 'C']
     assert list(stacks['3']) == ['P']
 
+def test_move_crates():
+    stacks = {'1': ['A', 'B', 'C'], '2': ['D']}
+    move_crates(stacks, 2, '1', '2', keep_order=False)
+    assert stacks == {'1': ['A'], '2': ['D', 'C', 'B']}
+    move_crates(stacks, 3, '2', '1', keep_order=True)
+    assert stacks == {'1': ['A', 'D', 'C', 'B'], '2': []}
+    move_crates(stacks, 0, '1', '2', keep_order=True)
+    assert stacks == {'1': ['A', 'D', 'C', 'B'], '2': []}
+
+def test_move_too_many_crates():
+    stacks = {'1': ['A', 'B', 'C'], '2': []}
+    try:
+        move_crates(stacks, 5, '1', '2', keep_order=True)
+        assert False
+    except IndexError:
+        pass
+    assert stacks == {'1': ['A', 'B', 'C'], '2': []}
+
+def test_decode_steps():
+    data = fetch_data('sample_data/day05.txt')
+    stacks = get_starting_stacks(data)
+    assert list(decode_steps(data, list(stacks))) == [1, 1, 0,  3, 0, 2,  2, 1, 0,  1, 0, 1]
+
+def test_run_steps():
+    data = fetch_data('sample_data/day05.txt')
+    stacks = get_starting_stacks(data)
+    columns = list(stacks.values())
+    run_steps(decode_steps(data, list(stacks)), columns, keep_order=False)
+    assert columns == [['C'], ['M'], ['P', 'D', 'N', 'Z']]
+
+def test_get_stack_tops_with_other_mover():
+    data = fetch_data('sample_data/day05.txt')
+    assert get_stack_tops(data, lambda ln, stacks: run_step_part_2(ln, stacks)) == 'MCD'
+
+def test_get_stack_tops_replay_backwards():
+    data = fetch_data('sample_data/day05.txt')
+    assert get_stack_tops(data, replay_backwards=True) == 'CMZ'
+    data = fetch_data('sample_data/day05.txt')
+    assert get_stack_tops(data, run_step_part_2, replay_backwards=True) == 'MCD'
+
+def test_trace_stack_tops_matches_moving_crates():
+    import random
+    rng = random.Random(5)
+    for keep_order in (False, True):
+        stacks = [[f'{s}{i}' for i in range(rng.randrange(1, 6))] for s in range(5)]
+        moved = [list(stack) for stack in stacks]
+        steps = array('l')
+        for _ in range(200):
+            from_stack, to_stack = rng.sample(range(5), 2)
+            if moved[from_stack]:
+                num_crates = rng.randrange(1, len(moved[from_stack]) + 1)
+                steps.extend([num_crates, from_stack, to_stack])
+                move_crates(moved, num_crates, from_stack, to_stack, keep_order)
+        expected = ''.join(stack[-1] for stack in moved if stack)
+        assert trace_stack_tops(steps, stacks, keep_order) == expected
+
 def test_get_stack_tops():
     data = fetch_data('sample_data/day05.txt')
     assert get_stack_tops(data) == 'CMZ'
@@ -2,13 +2,68 @@ def fetch_data(path):
     with open(path, 'r') as f:
         return f.readline().rstrip()
 
+
+# Looks for the first run of distinct characters of each window size, in one
+# pass. It remembers where each byte was last seen: the run of distinct
+# characters ending here starts just after the latest repeat, so every step
+# is O(1) however big the windows are.
+class MarkerScanner:
+    def __init__(self, window_sizes):
+        self.pending = sorted(set(window_sizes))
+        self.found = {}
+        self.last_seen = [-1] * 256
+        self.run_start = 0
+        self.position = 0
+
+    # Scans more of the signal (bytes). Returns True once every window size has been found.
+    def feed(self, chunk):
+        last_seen, run_start, position, pending = self.last_seen, self.run_start, self.position, self.pending
+        for c in chunk:
+            if last_seen[c] >= run_start:
+                run_start = last_seen[c] + 1
+            last_seen[c] = position
+            position += 1
+            while pending and position - run_start >= pending[0]:
+                self.found[pending.pop(0)] = position
+            if not pending:
+                break
+        self.run_start, self.position = run_start, position
+        return not pending
+
+
+# Characters read before each window size's marker ends, e.g. {4: 7, 14: 19}.
+# Sizes with no marker in the data are left out.
+def find_markers(data, window_sizes):
+    if isinstance(data, str):
+        data = data.encode()
+    scanner = MarkerScanner(window_sizes)
+    scanner.feed(data)
+    return scanner.found
+
 def chars_to_marker(data, window_size):
-    window_start = 0
-    while True:
-        window_end = window_start + window_size
-        if len(set(data[window_start:window_end])) == window_size:
-            return window_end
-        window_start += 1
+    return find_markers(data, [window_size]).get(window_size)
+
+# find_markers for a signal file, read chunk_size bytes at a time so memory
+# use doesn't depend on the file size. Reading stops as soon as every marker
+# has been found, or at the end of the first line.
+def scan_file(path, window_sizes, chunk_size=1 << 20):
+    scanner = MarkerScanner(window_sizes)
+    held_back = b''
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            chunk = held_back + chunk
+            end_of_line = chunk.find(b'\n')
+            if end_of_line != -1:
+                chunk = chunk[:end_of_line].rstrip(b'\r')
+            elif chunk.endswith(b'\r'):
+                # Might be the start of a \r\n split across chunks: wait and see.
+                chunk, held_back = chunk[:-1], b'\r'
+            else:
+                held_back = b''
+            if scanner.feed(chunk) or end_of_line != -1:
+                return scanner.found
+    scanner.feed(held_back)
+    return scanner.found
 
 #--------------------- tests -------------------------#
 
@@ -20,9 +75,32 @@ def test_chars_to_marker():
     data = fetch_data('sample_data/day06.txt')
     assert chars_to_marker(data, window_size=14) == 19
 
+def test_find_markers():
+    assert find_markers('mjqjpqmgbljsphdztnvjfqwrcgsmlb', [4, 14]) == {4: 7, 14: 19}
+    assert find_markers(b'bvwbjplbgvbhsrlpgdmjqwftvncz', [14, 4]) == {4: 5, 14: 23}
+    assert find_markers(b'nppdvjthqldpwncqszvftbrmjlhg', [4, 14, 1]) == {1: 1, 4: 6, 14: 23}
+    assert find_markers('aaaa', [2]) == {}
+    assert chars_to_marker('aaaa', 2) is None
+
+def test_scan_file(tmp_path):
+    assert scan_file('sample_data/day06.txt', [4, 14], chunk_size=3) == {4: 7, 14: 19}
+    path = tmp_path / 'signal.txt'
+    path.write_bytes(b'aaaaaaabcd\r\nefghijklmnop')
+    assert scan_file(path, [4, 5], chunk_size=4) == {4: 10}
+    path.write_bytes(b'abc\r\n')
+    assert scan_file(path, [4], chunk_size=4) == {}
+    assert chars_to_marker(fetch_data(path), 4) is None
+
+def test_find_markers_matches_sets():
+    import random
+    rng = random.Random(6)
+    data = ''.join(rng.choice('abcdefghij') for _ in range(2000))
+    for window_size in range(1, 11):
+        expected = next((i + window_size for i in range(len(data)) if len(set(data[i:i+window_size])) == window_size), None)
+        assert chars_to_marker(data, window_size) == expected
+
 
 #-----------------------------------------------------#
 
 if __name__ == "__main__":
-    data = fetch_data('data/day06.txt')
-    print(chars_to_marker(data, window_size=14))
+    print(scan_file('data/day06.txt', [14])[14])
@@ -1,28 +1,49 @@
 import re
+from array import array
+from bisect import bisect_left
 
 class Dir:
+    __slots__ = ('name', '_contents', '_children', '_parent', 'total_size')
+
     def __init__(self, name):
         self.name = name
         self._contents = []
-    
+        self._children = {}
+        self._parent = None
+        self.total_size = 0
+
+    # Sizes this directory and every one below it in one pass, without
+    # recursion (so deep trees are fine); each Dir keeps its size in total_size.
+    # If sizelist is given, directory sizes are added to it in post-order:
+    # each directory after everything inside it.
     def size(self, sizelist=None):
-        my_size = sum(c.size(sizelist) for c in self._contents)
-        
-        if sizelist is not None:
-            sizelist.append(my_size)
-        return my_size
+        stack = [(self, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if children_done:
+                node.total_size = sum(c.total_size for c in node._contents)
+                if sizelist is not None:
+                    sizelist.append(node.total_size)
+            else:
+                stack.append((node, True))
+                stack.extend((c, False) for c in reversed(node._contents) if isinstance(c, Dir))
+        return self.total_size
 
 
+    # Listing the same directory again doesn't add its contents twice.
     def add(self, child):
+        if child.name in self._children:
+            return
         child._parent = self
         self._contents.append(child)
+        self._children[child.name] = child
     
     def find(self, arg):
         val = None
         if arg == '..':
             val = self._parent
         else:
-            val = next(c for c in self._contents if c.name == arg)
+            val = self._children.get(arg)
         
         if not val:
             raise ValueError(f"Can't move to {arg} from {self.name}")
@@ -30,9 +51,11 @@ class Dir:
 
 
 class File:
+    __slots__ = ('name', '_size', '_parent', 'total_size')
+
     def __init__(self, size, name):
         self.name = name
-        self._size = int(size)
+        self._size = self.total_size = int(size)
 
     def size(self, *ignored):
         return self._size
@@ -57,6 +80,8 @@ def build_filesystem_from_terminal_output(data):
         if arg1 == 'cd':
             if not filesystem:
                 filesystem = cwd = Dir(name=arg2)
+            elif arg2 == filesystem.name:
+                cwd = filesystem
             else:
                 cwd = cwd.find(arg2) 
         elif arg1 == 'dir':
@@ -66,18 +91,247 @@ def build_filesystem_from_terminal_output(data):
     return filesystem
 
 
+# The same filesystem as Dir and File objects, but stored as parallel arrays
+# indexed by node number (parent, size, interned name id, whether it's a
+# directory), for transcripts with millions of entries. Node 0 is the root,
+# and a node is always added after its parent, so one sweep backwards over
+# the arrays adds every size into its parent's: no tree walk at all.
+# TreeDir and TreeFile give a Dir/File-like view of a node.
+class Tree:
+    def __init__(self, root_name='/'):
+        self.name_ids = {}
+        self.name_list = []
+        self.parents = array('l', [-1])
+        self.sizes = array('q', [0])
+        self.names = array('l', [self._intern(root_name)])
+        self.is_dir = bytearray([1])
+        # Directories whose listing we've had, so a second listing is skipped.
+        self.listed = bytearray([0])
+        # Finds directories (parent << 32 | name id -> index) for cd. Files are
+        # never looked up, so they only take up room in the arrays.
+        self.dir_index = {}
+        self.root = TreeDir(self, 0)
+
+    def _intern(self, name):
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = self.name_ids[name] = len(self.name_list)
+            self.name_list.append(name)
+        return name_id
+
+    def __len__(self):
+        return len(self.parents)
+
+    # Adds a file (or, with size None, a directory) and returns its index,
+    # or None if parent's listing was already done.
+    def add(self, parent, name, size=None):
+        if self.listed[parent]:
+            return None
+        name_id = self._intern(name)
+        if size is None:
+            key = parent << 32 | name_id
+            if key in self.dir_index:
+                return self.dir_index[key]
+            self.dir_index[key] = len(self.parents)
+        self.parents.append(parent)
+        self.sizes.append(0 if size is None else int(size))
+        self.names.append(name_id)
+        self.is_dir.append(size is None)
+        self.listed.append(0)
+        return len(self.parents) - 1
+
+    def finish_listing(self, index):
+        self.listed[index] = 1
+
+    def find(self, parent, name):
+        if name == '..':
+            index = self.parents[parent]
+        else:
+            name_id = self.name_ids.get(name, -1)
+            index = self.dir_index.get(parent << 32 | name_id, -1) if name_id >= 0 else -1
+        if index < 0:
+            raise ValueError(f"Can't move to {name} from {self.name_list[self.names[parent]]}")
+        return index
+
+    # Every node's total size, files and directories alike.
+    def total_sizes(self):
+        totals = array('q', self.sizes)
+        parents = self.parents
+        for i in range(len(totals) - 1, 0, -1):
+            totals[parents[i]] += totals[i]
+        return totals
+
+    # The total size of each directory, the root last.
+    def dir_sizes(self):
+        totals = self.total_sizes()
+        return [totals[i] for i in range(len(totals) - 1, -1, -1) if self.is_dir[i]]
+
+
+class TreeDir:
+    __slots__ = ('tree', 'index')
+
+    def __init__(self, tree, index):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def name(self):
+        return self.tree.name_list[self.tree.names[self.index]]
+
+    def _node(self, index):
+        return (TreeDir if self.tree.is_dir[index] else TreeFile)(self.tree, index)
+
+    # Sizes of this directory and (if sizelist is given) of each directory in
+    # it, every directory after the ones inside it, as with Dir.size.
+    def size(self, sizelist=None):
+        tree = self.tree
+        totals = tree.total_sizes()
+        if sizelist is not None:
+            # Nodes come after their parents, so one forward sweep finds the subtree.
+            inside = bytearray(len(tree))
+            inside[self.index] = 1
+            for i in range(self.index + 1, len(tree)):
+                inside[i] = inside[tree.parents[i]]
+            sizelist += [totals[i] for i in range(len(tree) - 1, self.index - 1, -1) if inside[i] and tree.is_dir[i]]
+        return totals[self.index]
+
+    # These return None, like Tree.add, once this directory's listing is done.
+    def add_dir(self, name):
+        index = self.tree.add(self.index, name)
+        return None if index is None else TreeDir(self.tree, index)
+
+    def add_file(self, size, name):
+        index = self.tree.add(self.index, name, size)
+        return None if index is None else TreeFile(self.tree, index)
+
+    def find(self, arg):
+        return self._node(self.tree.find(self.index, arg))
+
+    def contents(self):
+        return [self._node(i) for i, parent in enumerate(self.tree.parents) if parent == self.index]
+
+
+class TreeFile:
+    __slots__ = ('tree', 'index')
+
+    def __init__(self, tree, index):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def name(self):
+        return self.tree.name_list[self.tree.names[self.index]]
+
+    def size(self, *ignored):
+        return self.tree.sizes[self.index]
+
+
+def build_tree_from_terminal_output(data):
+    tree = cwd = None
+    listing = False
+    for arg1, arg2 in data:
+        if arg1 == 'cd':
+            if tree is None:
+                tree = Tree(root_name=arg2)
+                cwd = 0
+                continue
+            # A directory is listed all at once, so once we move on we've seen it all.
+            if listing:
+                tree.finish_listing(cwd)
+                listing = False
+            if arg2 == tree.root.name:
+                cwd = 0
+            else:
+                cwd = tree.find(cwd, arg2)
+        else:
+            tree.add(cwd, arg2, None if arg1 == 'dir' else arg1)
+            listing = True
+    return tree
+
+
+# Builds the filesystem a line at a time (taking the same lines as
+# build_filesystem_from_terminal_output), keeping every directory's size up
+# to date as it goes: a file's size is added to each directory above it, so a
+# line costs O(depth). The sorted list of directory sizes is only rebuilt when
+# it's asked for after something changed (O(d log d) for d directories), so
+# both parts can be asked at any point while a transcript is still coming in
+# without slowing down the lines in between.
+class LiveFilesystem:
+    def __init__(self, small_dir_limit=100000):
+        self.root = self.cwd = None
+        self.dirs = []
+        self._sorted_sizes = []
+        self._sizes_changed = False
+        self.small_dir_limit = small_dir_limit
+        self.small_dirs_total = 0
+
+    def ingest(self, lines):
+        for arg1, arg2 in lines:
+            self.ingest_line(arg1, arg2)
+
+    def ingest_line(self, arg1, arg2):
+        if arg1 == 'cd':
+            if not self.root:
+                self.root = self.cwd = Dir(name=arg2)
+                self._add_dir(self.root)
+            elif arg2 == self.root.name:
+                self.cwd = self.root
+            else:
+                self.cwd = self.cwd.find(arg2)
+        elif arg2 in self.cwd._children:
+            return
+        elif arg1 == 'dir':
+            d = Dir(name=arg2)
+            self.cwd.add(d)
+            self._add_dir(d)
+        else:
+            file = File(size=arg1, name=arg2)
+            self.cwd.add(file)
+            limit = self.small_dir_limit
+            d = self.cwd
+            while d:
+                old_size = d.total_size
+                d.total_size = new_size = old_size + file.total_size
+                if old_size <= limit:
+                    self.small_dirs_total -= old_size
+                if new_size <= limit:
+                    self.small_dirs_total += new_size
+                d = d._parent
+            self._sizes_changed = True
+
+    def _add_dir(self, d):
+        self.dirs.append(d)
+        self._sizes_changed = True
+
+    @property
+    def sorted_sizes(self):
+        if self._sizes_changed:
+            self._sorted_sizes = sorted(d.total_size for d in self.dirs)
+            self._sizes_changed = False
+        return self._sorted_sizes
+
+    def total_used_space(self):
+        return self.root.total_size if self.root else 0
+
+    # Size of the smallest directory that's at least space_needed, or None.
+    def smallest_dir_freeing(self, space_needed):
+        sizes = self.sorted_sizes
+        i = bisect_left(sizes, space_needed)
+        return sizes[i] if i < len(sizes) else None
+
+
+# Both parts from one build of the filesystem and one sizing pass.
+def solve_both_parts(data):
+    sizelist = build_tree_from_terminal_output(data).dir_sizes()
+    total_used_space = sizelist[-1]
+    space_needed = total_used_space - 40000000
+    return sum(s for s in sizelist if s <= 100000), min(s for s in sizelist if s >= space_needed)
+
 def solve_part_one(data):
-    filesystem = build_filesystem_from_terminal_output(data)
-    sizelist = []
-    filesystem.size(sizelist)
-    return sum(s for s in sizelist if s <= 100000)
+    return solve_both_parts(data)[0]
 
 def solve_part_two(data):
-    filesystem = build_filesystem_from_terminal_output(data)
-    sizelist = []
-    total_used_space = filesystem.size(sizelist)
-    space_needed = total_used_space - 40000000
-    return sorted(s for s in sizelist if s >= space_needed)[0]
+    return solve_both_parts(data)[1]
 
 #--------------------- tests -------------------------#
 
@@ -128,6 +382,76 @@ def test_solve_part_two():
     data = fetch_data('sample_data/day07.txt')
     assert solve_part_two(data) == 24933642
 
+def test_solve_both_parts():
+    data = fetch_data('sample_data/day07.txt')
+    assert solve_both_parts(data) == (95437, 24933642)
+
+def test_live_filesystem():
+    live = LiveFilesystem()
+    lines = list(fetch_data('sample_data/day07.txt'))
+    live.ingest(lines[:10])
+    # Just the listings of / and a so far.
+    assert live.total_used_space() == 14848514 + 8504156 + 29116 + 2557 + 62596
+    assert live.small_dirs_total == 29116 + 2557 + 62596
+    live.ingest(lines[10:])
+    assert live.total_used_space() == 48381165
+    assert live.small_dirs_total == 95437
+    assert live.smallest_dir_freeing(live.total_used_space() - 40000000) == 24933642
+    assert live.smallest_dir_freeing(10**9) is None
+    assert live.sorted_sizes == [584, 94853, 24933642, 48381165]
+    live.ingest(lines)
+    assert live.sorted_sizes == [584, 94853, 24933642, 48381165]
+
+def test_tree():
+    tree = build_tree_from_terminal_output(fetch_data('sample_data/day07.txt'))
+    assert len(tree) == 14
+    assert tree.root.name == '/'
+    assert tree.root.size() == 48381165
+    # Each directory comes after the ones inside it, but not in a depth first order.
+    assert tree.dir_sizes() == [584, 24933642, 94853, 48381165]
+    a = tree.root.find('a')
+    assert a.name == 'a'
+    assert a.find('..').index == 0
+    sizelist = []
+    assert a.size(sizelist) == 94853
+    assert sizelist == [584, 94853]
+    contents = {c.name: c for c in tree.root.contents()}
+    assert sorted(contents) == ['a', 'b.txt', 'c.dat', 'd']
+    assert contents['b.txt'].size() == 14848514
+
+def test_tree_skips_repeated_listing():
+    lines = list(fetch_data('sample_data/day07.txt'))
+    lines += [['cd', '/'], ['dir', 'a'], ['1', 'new.txt'], ['cd', 'a'], ['cd', 'e'], ['1', 'new.txt']]
+    tree = build_tree_from_terminal_output(lines)
+    assert tree.dir_sizes()[-1] == 48381165
+
+def test_tree_views():
+    tree = Tree()
+    a = tree.root.add_dir('a')
+    assert tree.root.add_dir('a').index == a.index
+    a.add_file('10', 'x')
+    tree.root.add_file('5', 'x')
+    assert tree.root.size() == 15
+    assert tree.name_list == ['/', 'a', 'x']
+    try:
+        a.find('nope')
+        assert False
+    except ValueError:
+        pass
+    tree.finish_listing(0)
+    assert tree.root.add_dir('b') is None
+    assert tree.root.add_file('5', 'y') is None
+    assert tree.root.size() == 15
+
+def test_deep_tree_and_repeated_listing():
+    lines = [['cd', '/']]
+    for i in range(5000):
+        lines += [['dir', 'd'], ['1', 'f'], ['cd', 'd']]
+    lines += [['cd', '/'], ['dir', 'd'], ['1', 'f']]
+    filesystem = build_filesystem_from_terminal_output(lines)
+    assert filesystem.size() == 5000
+    assert len(filesystem._contents) == 2
+
 #-----------------------------------------------------#
 
 if __name__ == "__main__":
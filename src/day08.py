@@ -1,8 +1,9 @@
 import numpy as np
+import inputs
+from grid import Grid, shifted
 
 def fetch_data(path):
-    with open(path, 'r') as f:
-        return np.array([[int(n) for n in ln.rstrip()] for ln in f])
+    return Grid.from_lines(inputs.lines(path)).cells
 
 def is_visible(data, x, y):
     return (
@@ -20,6 +21,22 @@ def count_visible(data):
             count += is_visible(data, x, y)
     return count
 
+# Every tree's visibility at once. Looking in from each edge, a tree is
+# visible if it's taller than the running maximum of the trees before it,
+# so that's one np.maximum.accumulate per direction rather than a max over a
+# slice for each tree.
+def visible_mask(data):
+    heights = data.astype(np.int16)
+    visible = np.zeros(heights.shape, bool)
+    for axis in (0, 1):
+        step = (1, 0) if axis == 0 else (0, 1)
+        for from_far_edge in (False, True):
+            looking = np.flip(heights, axis) if from_far_edge else heights
+            tallest_before = shifted(np.maximum.accumulate(looking, axis=axis), step, fill=-1)
+            seen = looking > tallest_before
+            visible |= np.flip(seen, axis) if from_far_edge else seen
+    return visible
+
 def count_trees(li, height_limit):
     count = 0
     for tree in li:
@@ -44,6 +61,39 @@ def max_scenic_score(data):
             best_seen = max(scenic_score(data, x, y), best_seen)
     return best_seen
 
+# How far each tree can see to its left (towards lower y), for the whole forest.
+# Heights are 0-9, so each row keeps a table of the last column where a tree at
+# least each height was seen: the view stops there. Every row is done at once,
+# a column at a time.
+def viewing_distances_left(data):
+    heights = data.astype(np.intp)
+    rows, cols = heights.shape
+    last_at_least = np.zeros((rows, 10), np.intp)
+    distances = np.zeros((rows, cols), np.intp)
+    all_heights = np.arange(10)
+    for y in range(cols):
+        column = heights[:, y]
+        distances[:, y] = y - last_at_least[np.arange(rows), column]
+        last_at_least[all_heights <= column[:, None]] = y
+    return distances
+
+# Every tree's scenic score, as an array the shape of the forest. The other
+# directions are the same as looking left in a flipped or transposed forest.
+def scenic_scores(data):
+    left = viewing_distances_left(data)
+    right = np.fliplr(viewing_distances_left(np.fliplr(data)))
+    up = viewing_distances_left(data.T).T
+    down = np.flipud(viewing_distances_left(np.flipud(data).T).T)
+    return (left * right * up * down).astype(np.int64)
+
+# The k best trees as ((x, y), score), best first.
+def top_scenic_trees(data, k):
+    scores = scenic_scores(data).ravel()
+    k = min(k, scores.size)
+    best = np.argpartition(scores, scores.size - k)[scores.size - k:]
+    best = best[np.argsort(-scores[best], kind='stable')]
+    return [(tuple(int(i) for i in np.unravel_index(i, data.shape)), int(scores[i])) for i in best]
+
 #--------------------- tests -------------------------#
 
 # Let's make sure I understand how arrays work.
@@ -65,6 +115,15 @@ def test_count_visible():
     data = fetch_data('sample_data/day08.txt')
     assert count_visible(data) == 21
 
+def test_visible_mask():
+    data = fetch_data('sample_data/day08.txt')
+    mask = visible_mask(data)
+    assert mask.sum() == 21
+    assert mask[1, 1] and not mask[1, 3] and not mask[2, 2]
+    rng = np.random.default_rng(8)
+    data = rng.integers(0, 10, (12, 9)).astype(np.uint8)
+    assert visible_mask(data).tolist() == [[is_visible(data, x, y) for y in range(9)] for x in range(12)]
+
 def test_scenic_score():
     data = fetch_data('sample_data/day08.txt')
     assert scenic_score(data, 1, 2) == 4
@@ -74,8 +133,23 @@ def test_max_scenic_score():
     data = fetch_data('sample_data/day08.txt')
     assert max_scenic_score(data) == 8
 
+def test_scenic_scores():
+    data = fetch_data('sample_data/day08.txt')
+    scores = scenic_scores(data)
+    assert scores[1, 2] == 4
+    assert scores[3, 2] == 8
+    assert scores.max() == 8
+    rng = np.random.default_rng(25)
+    data = rng.integers(0, 10, (11, 7)).astype(np.uint8)
+    assert scenic_scores(data).tolist() == [[scenic_score(data, x, y) for y in range(7)] for x in range(11)]
+
+def test_top_scenic_trees():
+    data = fetch_data('sample_data/day08.txt')
+    assert top_scenic_trees(data, 3) == [((3, 2), 8), ((2, 1), 6), ((1, 2), 4)]
+    assert len(top_scenic_trees(data, 100)) == 25
+
 #-----------------------------------------------------#
 
 if __name__ == "__main__":
     data = fetch_data('data/day08.txt')
-    print(max_scenic_score(data))
+    print(int(scenic_scores(data).max()))
@@ -1,4 +1,6 @@
 
+import inputs
+
 class Pos:
     def __init__(self, x, y):
         self.x = x
@@ -30,10 +32,9 @@ class Pos:
 
 
 def fetch_data(path):
-    with open(path, 'r') as f:
-        for ln in f:
-            direction, distance = ln.rstrip().split()
-            yield direction, int(distance)
+    for ln in inputs.lines(path):
+        direction, distance = ln.split()
+        yield direction.decode(), int(distance)
 
 def track_visits(data):
     head = tail = Pos(0,0)
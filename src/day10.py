@@ -1,12 +1,13 @@
+import inputs
+
 def fetch_data(path):
-    with open(path, 'r') as f:
-        for ln in f:
-            # each instruction gives (cycles to wait, value to add)
-            vals = ln.rstrip().split()
-            if vals[0] == 'noop':
-                yield 1, 0
-            else:
-                yield 2, int(vals[1])
+    for ln in inputs.lines(path):
+        # each instruction gives (cycles to wait, value to add)
+        vals = ln.split()
+        if vals[0] == b'noop':
+            yield 1, 0
+        else:
+            yield 2, int(vals[1])
 
 def execute(data):
     X = 1
@@ -1,6 +1,6 @@
 import numpy as np
 from collections import namedtuple
-from collections import deque
+import search
 
 Pos = namedtuple("Pos", "x y")
 
@@ -9,6 +9,7 @@ class Heightmap:
         self.grid = np.array(grid)
         self.start = Pos(*start)
         self.target = Pos(*target)
+        self.heights = self.grid.ravel().tolist()
 
     def can_move_to(self, explore_from):
         neighbours = []
@@ -30,27 +31,44 @@ class Heightmap:
     # or infinity if there's no way to get to the target.
     def shortest_path(self, starting_point=None):
         if starting_point is None:
-            starting_point = self.start   
-        path_length = self._depth_first_search(starting_point)
-        return path_length
-
-
-    def _depth_first_search(self, starting_point):
-        explored = {starting_point}
-        queue = deque([(starting_point, 0)])
-        while queue:
-            v, path_length = queue.popleft()
-            if v == self.target:
-                return path_length
-            for neighbour in self.can_move_to(explore_from=v):
-                if neighbour not in explored:
-                    explored.add(neighbour)
-                    queue.append((neighbour, path_length+1))
-        return np.inf
-
+            starting_point = self.start
+        path_length = search.shortest_path_length(
+            [self._state(starting_point)], self._steps_up, lambda s: s == self._state(self.target), self.grid.size)
+        return np.inf if path_length is None else path_length
+
+    # Cells are numbered row by row, so the search can use a bitmap for what it's seen.
+    def _state(self, pos):
+        return pos.x * self.grid.shape[1] + pos.y
+
+    def _neighbour_states(self, state):
+        rows, cols = self.grid.shape
+        x, y = divmod(state, cols)
+        if x > 0:
+            yield state - cols
+        if x < rows - 1:
+            yield state + cols
+        if y > 0:
+            yield state - 1
+        if y < cols - 1:
+            yield state + 1
+
+    def _steps_up(self, state):
+        heights = self.heights
+        limit = heights[state] + 1
+        return [n for n in self._neighbour_states(state) if heights[n] <= limit]
+
+    # The moves from _steps_up, followed backwards.
+    def _steps_down(self, state):
+        heights = self.heights
+        return [n for n in self._neighbour_states(state) if heights[state] <= heights[n] + 1]
+
+    # One search back from the target to whichever 'a' is nearest,
+    # rather than a search forward from every 'a'.
     def shortest_path_from_all_a(self):
-        possible_starts = zip(*np.where(self.grid == ord('a')))
-        return min(self.shortest_path(starting_point=Pos(x,y)) for x, y in possible_starts)
+        heights = self.heights
+        path_length = search.shortest_path_length(
+            [self._state(self.target)], self._steps_down, lambda s: heights[s] == ord('a'), self.grid.size)
+        return np.inf if path_length is None else path_length
 
 
 def fetch_data(path):
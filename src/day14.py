@@ -1,44 +1,56 @@
+import numpy as np
+from grid import Grid, shifted
+
+AIR, ROCK, SAND = 0, 1, 2
+names = ['air', 'rock', 'sand']
 
 class Cave:
     def __init__(self):
-        self._content = dict()
+        self._content = Grid((1, 1), origin=(500, 0))
         self._furthest_sand_can_fall = 0
 
     def add_rocks(self, from_x, from_y, to_x, to_y):
-        start_x = min(from_x, to_x)
-        end_x = max(from_x+1, to_x+1)
-        for x in range(start_x, end_x):
-            self._content[(x, from_y)] = 'rock'
-
-        start_y = min(from_y, to_y)
-        end_y = max(from_y+1, to_y+1)
-        for y in range(start_y, end_y):
-            self._content[(from_x, y)] = 'rock'
-
-        self._furthest_sand_can_fall = max(self._furthest_sand_can_fall, end_y)
+        # Paths are straight lines, so each one is a thin box of cells.
+        self._content.fill((min(from_x, to_x), min(from_y, to_y)), (max(from_x, to_x), max(from_y, to_y)), ROCK)
+        self._furthest_sand_can_fall = max(self._furthest_sand_can_fall, from_y+1, to_y+1)
 
 
     def add_sand(self, x, y):
+        cave = self._content
         while y < self._furthest_sand_can_fall:
-            if self(x, y+1) == 'air':
+            if cave[x, y+1] == AIR:
                 x, y = x, y+1
-            elif self(x-1, y+1) == 'air':
+            elif cave[x-1, y+1] == AIR:
                 x, y = x-1, y+1
-            elif self(x+1, y+1) == 'air':
+            elif cave[x+1, y+1] == AIR:
                 x, y = x+1, y+1
             else:
                 break
-        self._content[(x, y)] = 'sand'
+        cave[x, y] = SAND
         return x, y
 
+    # Rather than drop each unit, fill the cave a row at a time: a cell ends up
+    # with sand if it isn't rock and sand can reach it from one of the 3 cells above.
     def add_sand_until_stop(self):
-        units = 1
-        while self.add_sand(500, 0) != (500, 0):
-            units += 1
+        floor = self._furthest_sand_can_fall
+        cave = self._content
+        cave.include((500 - floor - 1, floor))
+        cave.include((500 + floor + 1, 0))
+
+        x, top = cave.index((500, 0))
+        rock = cave.cells == ROCK
+        sand = np.zeros_like(rock)
+        sand[x, top] = True
+        for y in range(top+1, top+floor+1):
+            above = sand[:, y-1]
+            sand[:, y] = (above | shifted(above, (1,)) | shifted(above, (-1,))) & ~rock[:, y]
+
+        units = int(np.count_nonzero(sand)) - cave.count(SAND)
+        cave.cells[sand] = SAND
         return units
 
     def __call__(self, x, y):
-        return self._content.get((x,y), 'air')
+        return names[self._content[x, y]]
 
 
 def fetch_data(path):
@@ -1,5 +1,5 @@
-import re
-from tqdm import tqdm
+import inputs
+from intervals import IntervalSet
 
 class Sensor:
     def __init__(self, sensor_x, sensor_y, beacon_x, beacon_y):
@@ -26,37 +26,29 @@ class Sensor:
 
 
 def fetch_data(path):
-    with open(path, 'r') as f:
-        sensors = []
-        for ln in f:
-            values = [int(n) for n in re.findall(r'-?\d+', ln)]
-            sensors.append(Sensor(*values))
-        return sensors
+    sensors = []
+    for ln in inputs.lines(path):
+        sensors.append(Sensor(*inputs.ints_in(ln, signed=True)))
+    return sensors
 
 
+def no_beacon_ranges_for_row(sensors, row):
+    ranges = (sensor.no_beacons_range_for_row(row) for sensor in sensors)
+    return IntervalSet(r for r in ranges if r is not None)
+
+
+# Everywhere the sensors cover, apart from the beacons we already know about.
 def count_no_beacon_positions_for_row(sensors, row):
-    positions = set()
-    for sensor in sensors:
-        positions |= sensor.cannot_be_beacons_for_row(row)
-    return len(positions)
+    covered = no_beacon_ranges_for_row(sensors, row)
+    beacons = {sensor.closest_beacon for sensor in sensors if sensor.closest_beacon[1] == row}
+    return len(covered) - sum(x in covered for x, y in beacons)
 
 
 def find_distress_beacon(sensors, max_x, max_y):
+    from tqdm import tqdm
     for y in tqdm(range(max_y+1)):
-        ranges = (sensor.no_beacons_range_for_row(y) for sensor in sensors)
-        ranges = sorted(r for r in ranges if r is not None)
-
-        left_edge = right_edge = None
-        for left_for_this_sensor, right_for_this_sensor in ranges:
-            if left_edge is None:
-                left_edge, right_edge = left_for_this_sensor, right_for_this_sensor
-            else:
-                if (right_edge +1) < left_for_this_sensor <= max_x:
-                    return right_edge +1, y
-                else:
-                    right_edge = max(right_edge, right_for_this_sensor)
-                    if left_edge < 0 and right_edge > max_x:
-                        break
+        for x, _ in no_beacon_ranges_for_row(sensors, y).gaps(0, max_x):
+            return x, y
 
 
 #--------------------- tests -------------------------#
@@ -80,6 +72,12 @@ def test_fetch_data():
 def test_count_no_beacon_positions_for_row():
     sensors = fetch_data('sample_data/day15.txt')
     assert count_no_beacon_positions_for_row(sensors, row=10) == 26
+    assert count_no_beacon_positions_for_row(sensors, row=2000000) == 0
+
+def test_no_beacon_ranges_for_row():
+    sensors = fetch_data('sample_data/day15.txt')
+    assert list(no_beacon_ranges_for_row(sensors, 10)) == [(-2, 24)]
+    assert list(no_beacon_ranges_for_row(sensors, 11).gaps(0, 20)) == [(14, 14)]
 
 def test_no_beacons_range_for_row():
     sensor = Sensor(8,7, 2,10)
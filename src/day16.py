@@ -1,7 +1,7 @@
 from itertools import chain, combinations
-from collections import deque
-from tqdm import tqdm
 import re
+import cache
+import search
 
 class Valve:
     def __init__(self, id, flow_rate, tunnels):
@@ -16,26 +16,20 @@ class Volcano:
     def add(self, valve):
         self.valves[valve.id] = valve
         
+    # Cost (in minutes) of going from each start to each target and turning it on.
+    # One breadth first search per start finds every target at once.
     def _routes_and_costs(self):
         targets = [k for k,v in self.valves.items() if v.flow_rate]
         starts = ['AA'] + targets[:]
+        ids = list(self.valves)
+        index = {id: i for i, id in enumerate(ids)}
+        tunnels = [[index[t] for t in self.valves[id].tunnels] for id in ids]
         routes_and_costs = dict()
 
         for start in starts:
-            routes_and_costs[start] = dict()
-            for target in targets:
-                # Depth first search to target
-                explored = {start}
-                queue = deque([(start, 0)])
-                while queue: 
-                    v, path_length = queue.popleft()
-                    if v == target:
-                        routes_and_costs[start][v] = path_length +1
-                        break
-                    for neighbour in self.valves[v].tunnels:
-                        if neighbour not in explored:
-                            explored.add(neighbour)
-                            queue.append((neighbour, path_length +1))
+            path_lengths = search.distances([index[start]], tunnels.__getitem__, len(ids))
+            routes_and_costs[start] = {target: path_lengths[index[target]] +1
+                                       for target in targets if path_lengths[index[target]] != -1}
         return routes_and_costs
 
     def _valves_and_rates(self):
@@ -73,6 +67,7 @@ class Volcano:
         # An idea: Agree at the start which valves you'll each go for!
         # Calculate the max release for all subsets of valves turned
         # Pick the 2 disjoint sets that have the highest total pressure
+        from tqdm import tqdm
         routes_and_costs = self._routes_and_costs()
         valves_and_rates = self._valves_and_rates()
         powerset = list(chain.from_iterable(combinations(valves_and_rates, i) for i in range(1, len(valves_and_rates))))
@@ -111,6 +106,11 @@ def fetch_data(path):
             ))
     return volcano
 
+
+@cache.keyed_on_input
+def most_pressure_with_elephant(path, minutes):
+    return fetch_data(path).most_pressure_with_elephant(minutes)
+
 #--------------------- tests -------------------------#
 
 def test_fetch_data():
@@ -150,6 +150,5 @@ def test_volcano_pressure_with_elephant():
 #-----------------------------------------------------#
 
 if __name__ == "__main__":
-    volcano = fetch_data('data/day16.txt')
-    print(volcano.most_pressure_with_elephant(26))
+    print(most_pressure_with_elephant('data/day16.txt', 26))
     
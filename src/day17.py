@@ -1,5 +1,6 @@
 
 import numpy as np
+import cycles
 
 class Rock:
     horizontal = np.ones((1,4), int)
@@ -34,6 +35,7 @@ class Chamber:
     def __init__(self, jets):
         self.content = np.zeros((1000, Chamber.width), int)
         self.jets = jets
+        self.last_jet = None
 
     def tower_height(self):
         height = self.content.shape[0]
@@ -82,6 +84,7 @@ class Chamber:
         while True:
             # Jet tries to move rock (if we bang into something, we can't)
             jet_idx, jet_direction = next(self.jets)
+            self.last_jet = jet_idx
             if self._can_move(rock, rock_pos_x, rock_pos_y, jet_direction):
                 rock_pos_y = rock_pos_y-1 if jet_direction == '<' else rock_pos_y+1
 
@@ -94,6 +97,27 @@ class Chamber:
 
         return f'{rock_name}, {jet_idx}, {self.tower_height()}\n'
 
+    # The top rows of the tower. Rocks can't fall further than this in practice,
+    # so together with the next rock and jet it decides everything that follows.
+    def surface(self, depth=32):
+        top = self.content.shape[0] - self.tower_height()
+        return self.content[top:top+depth].tobytes()
+
+
+# Drops rocks until the pattern of (rock, jet, surface) repeats, then
+# works out the rest from the height each repeat adds.
+def tower_height_after(jets, rock_count):
+    chamber = Chamber(jets)
+    rocks = Rock.cycle()
+    detector = cycles.CycleDetector()
+    rock_name = None
+    for dropped in range(rock_count):
+        if detector.add((rock_name, chamber.last_jet, chamber.surface()), chamber.tower_height()):
+            return detector.value_at(rock_count)
+        rock_name, rock = next(rocks)
+        chamber.drop((rock_name, rock))
+    return chamber.tower_height()
+
 def fetch_jets(path):
     with open(path, 'r') as f:
         ln = f.readline().rstrip()
@@ -173,50 +197,20 @@ def test_drop_2022_rocks():
     for _ in range(2022):
         chamber.drop(next(rocks))
     assert chamber.tower_height() == 3068
-    
-
-#-----------------------------------------------------#
-
-if __name__ == "__main__":
-    jets = fetch_jets('data/day17.txt')
-    chamber = Chamber(jets)
-    rocks = Rock.cycle()
-    patterns = []
-    for _ in range(10000):
-        state = chamber.drop(next(rocks))
-        patterns.append(state)
-    with open('patterns.txt', 'w') as f:
-        f.writelines(patterns)    
-    print(chamber.tower_height())
-
-    # Having a look in Excel :) 
-
-    #---------------------------------------------------#
-    # For sample data: 
-    # Pattern starts at 40th rock
-    # Pattern length is 35 rocks
-    # Pattern adds 53 to tower hieght
-    # We get to 66 before pattern starts
 
-    # So for 2022 rocks, we'd get:
-    ## 39 rocks, 66 height
-    ## 56 full patterns, 53 height each
-    ## The first 23 rocks of a pattern, which is 34 height
-    ## Total: 3068 .... Great, that's right!
+def test_tower_height_after():
+    assert tower_height_after(fetch_jets('sample_data/day17.txt'), 2022) == 3068
+    assert tower_height_after(fetch_jets('sample_data/day17.txt'), 1000000000000) == 1514285714288
+    assert tower_height_after(fetch_jets('sample_data/day17.txt'), 10) == 17
 
-    # And for 1 trillion rocks, we'd get:
-    # 1514285714288 ... Amazing! 
-
-    #---------------------------------------------------#
-    # For real data:
-    # I see (box, 2966) at rock 510, 2255, 4000. So repeats every 1745.
-    # Before the pattern starts, the first 71 rocks gets tower of 104
-    # Pattern length is 1745. Looks like:
-    #   first pattern adds 2737, and later ones add 2738 to tower height
-
-    # So for 2022 rocks (right answer is 3135), we get that right!
-    # And for 1 trillion ... Gold star!
 
+#-----------------------------------------------------#
 
+if __name__ == "__main__":
+    print(tower_height_after(fetch_jets('data/day17.txt'), 2022))
+    print(tower_height_after(fetch_jets('data/day17.txt'), 1000000000000))
 
-    
\ No newline at end of file
+    # Before tower_height_after, the pattern was found by writing out
+    # (rock, jet, height) for 10000 rocks and having a look in Excel :)
+    # For the sample data it starts at the 40th rock, is 35 rocks long and
+    # adds 53 to the tower height each time round.
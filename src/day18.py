@@ -1,63 +1,34 @@
 from collections import namedtuple
-from collections import deque
+import inputs
+from grid import Grid, ORTHOGONAL_3D, flood_fill, neighbour_count
 
 Pos = namedtuple("Pos", "x y z")
 
 
 class Scan:
     def __init__(self, cubes):
-        self.cubes = set(cubes)
-        
-         # Find extents
-        all_x, all_y, all_z = zip(*self.cubes)
-        self.min_extent = Pos(min(all_x)-1, min(all_y)-1, min(all_z)-1)
-        self.max_extent = Pos(max(all_x)+1, max(all_y)+1, max(all_z)+1)
-        
+        # One cell of air all round, so steam can get to every side.
+        self.lava = Grid.from_points(cubes, margin=1)
+        self.min_extent, self.max_extent = (Pos(*e) for e in self.lava.bounds())
     
+    # Every cube has 6 sides, minus the ones touching another cube.
     def surface_area(self):
-        surfaces = [6 - self.sides_touching(c) for c in self.cubes]
-        return sum(surfaces)
-
-    def sides_touching(self, target_cube):
-        touching = [n for n in Scan.get_neighbours(target_cube) if n in self.cubes]
-        return len(touching)
-
-    def get_neighbours(point):
-        x,y,z = point
-        return [Pos(x-1,y,z), Pos(x+1,y,z), 
-                Pos(x,y-1,z), Pos(x,y+1,z), 
-                Pos(x,y,z-1), Pos(x,y,z+1)]
-
-    def can_move_to(self, explore_from):
-        moves = []
-        for neighbour in Scan.get_neighbours(explore_from):
-            if ((self.min_extent.x <= neighbour.x <= self.max_extent.x) and
-                (self.min_extent.y <= neighbour.y <= self.max_extent.y) and
-                (self.min_extent.z <= neighbour.z <= self.max_extent.z) and
-                (neighbour not in self.cubes)):
-                moves.append(neighbour)
-        return moves
+        lava = self.lava.cells.astype(bool)
+        touching = neighbour_count(lava, ORTHOGONAL_3D)[lava].sum()
+        return int(6 * lava.sum() - touching)
 
+    # Steam spreads from the corner (outside the droplet) through all the air it can reach.
+    # Count the lava sides it touches.
     def exterior_surface_area(self):
-        area = 0
-        starting_point = self.min_extent
-        explored = {starting_point}
-        queue = deque([starting_point])
-        while queue:
-            steam_point = queue.popleft()
-            area += self.sides_touching(steam_point)
-            for neighbour in self.can_move_to(explore_from=steam_point):
-                if neighbour not in explored:
-                    explored.add(neighbour)
-                    queue.append(neighbour)
-        return area
+        lava = self.lava.cells.astype(bool)
+        steam = flood_fill(~lava, (0, 0, 0), ORTHOGONAL_3D)
+        return int(neighbour_count(steam, ORTHOGONAL_3D)[lava].sum())
 
 
 def fetch_data(path):
-    with open(path, 'r') as f:
-        for ln in f:
-            x,y,z = [int(n) for n in ln.split(',')]
-            yield Pos(x,y,z)
+    for ln in inputs.lines(path):
+        x,y,z = [int(n) for n in ln.split(b',')]
+        yield Pos(x,y,z)
 
 #--------------------- tests -------------------------#
 
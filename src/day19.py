@@ -4,8 +4,10 @@
 
 import operator
 import re
-from collections import defaultdict, deque
-import cProfile
+from collections import defaultdict
+import cache
+import profiling
+import search
 
 class Factory:
     inventory_indexes = {'ore': 0, 'clay': 1, 'obsidian': 2, 'geode': 3}
@@ -55,6 +57,7 @@ class Factory:
 
     # What could we make next?
     ## List the (robot_type, time) for all robot types we can make
+    @profiling.section
     def choices(self, state):
         robots_and_times = []
         for robot_type, materials_needed in self.blueprint.items():
@@ -79,6 +82,7 @@ class Factory:
 
 
     # Put in an order for a robot. We trust that this is one of the chocies().
+    @profiling.section
     def make(self, robot_to_make, time_needed, state):
         new_robots_and_materials = []
         for rock_type in Factory.inventory_indexes.keys():
@@ -122,26 +126,19 @@ def geode_count(state):
     
 
 # Ask the factory to crack the most geodes it can.
+@profiling.section
 def make_good_choices(factory, start=Factory.initial_state):
     most_geodes = 0
-    explored = {start}
-    queue = deque([start])
-    while queue:
-        state = queue.popleft()
-        if state[0] <= 1:
-            state = factory.run_out_clock(state)
-            most_geodes = max(most_geodes, geode_count(state))
-        else:
-            next_moves = factory.choices(state)
-            if len(next_moves) == 0:
-                state = factory.run_out_clock(state)
-                most_geodes = max(most_geodes, geode_count(state))
-
-            for robot_to_make, time_needed in next_moves:
-                option = factory.make(robot_to_make, time_needed, state)
-                if option not in explored:
-                    explored.add(option)
-                    queue.append(option)
+
+    def next_states(state):
+        nonlocal most_geodes
+        next_moves = factory.choices(state) if state[0] > 1 else []
+        if len(next_moves) == 0:
+            most_geodes = max(most_geodes, geode_count(factory.run_out_clock(state)))
+        return [factory.make(robot_to_make, time_needed, state) for robot_to_make, time_needed in next_moves]
+
+    for _ in search.reachable([start], next_states):
+        pass
     return most_geodes
 
 
@@ -167,6 +164,11 @@ def find_most_geodes_part_2(blueprints):
     return most_geodes
 
 
+@cache.keyed_on_input
+def most_geodes_part_2(path):
+    return find_most_geodes_part_2(fetch_data(path))
+
+
 #--------------------- tests -------------------------#
 
 def test_state():
@@ -256,10 +258,6 @@ def test_most_geodes_with_32_minutes():
 
 #-----------------------------------------------------#
 
-def foo():
-    blueprints = fetch_data('data/day19.txt')
-    most_geodes = find_most_geodes_part_2(blueprints)
-    print(most_geodes)
-
 if __name__ == "__main__":
-    cProfile.run('foo()', sort='cumulative')
+    most_geodes = most_geodes_part_2('data/day19.txt')
+    print(most_geodes)
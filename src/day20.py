@@ -1,10 +1,8 @@
 
+import inputs
+
 def fetch_data(path):
-    with open(path, 'r') as f:
-        data = []
-        for ln in f:
-            data.append(int(ln))
-    return data
+    return list(inputs.ints(path, signed=True))
 
 
 def mix_step(data, idx_in_data, remix):
@@ -1,4 +1,4 @@
-import cProfile
+import profiling
 from collections import Counter
 
 def fetch_data(path):
@@ -50,6 +50,7 @@ class Elf:
         dir = self.adjacent_directions[elf.pos()]
         self.neighbours.remove(dir)
 
+    @profiling.section
     def propose_move(self, direction_idx):
         if len(self.neighbours):
             for _ in range(len(Elf.direction_order)):
@@ -71,6 +72,7 @@ class Field:
                     self.elves_with_neighbours.add(elf)
               
 
+    @profiling.section
     def play(self, max_rounds=None):
         rounds = 0
         first_direction = 0
@@ -162,12 +164,9 @@ def test_play_to_end_with_large_example():
 
 #-----------------------------------------------------#
 
-def play():
+if __name__ == "__main__":
     elves = fetch_data('data/day23.txt')
     field = Field(elves)
     rounds = field.play()
     print(rounds)
 
-if __name__ == "__main__":
-    cProfile.run('play()', sort='cumulative')
-
@@ -1,4 +1,4 @@
-import cProfile
+import profiling
 
 
 def fetch_data(path):
@@ -25,6 +25,7 @@ class Field:
     }
     
 
+    @profiling.section
     def propose_move(self, elf, direction_idx):
         x,y = elf
         adjacent_positions = {
@@ -50,6 +51,7 @@ class Field:
         return elf
 
 
+    @profiling.section
     def play(self, max_rounds=None):
         rounds = 0
         first_direction = 0
@@ -116,15 +118,12 @@ def test_play_to_end_with_large_example():
 
 #-----------------------------------------------------#
 
-def play():
+if __name__ == "__main__":
     elves = fetch_data('data/day23.txt')
     field = Field(elves)
     rounds = field.play()
     print(rounds)
 
-if __name__ == "__main__":
-    cProfile.run('play()', sort='cumulative')
-
 
 # Runs in 18.75 minutes, can we improve?
 # 22169768 function calls in 1125.186 seconds
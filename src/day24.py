@@ -1,8 +1,9 @@
 import numpy as np
 import math
-import cProfile
+import cache
+import profiling
+import search
 from collections import namedtuple
-from collections import deque
 
 Pos = namedtuple("Pos", "x y")
 
@@ -49,24 +50,47 @@ class Valley:
         if pos.y < self.map.shape[1] -1:
             yield Pos(pos.x, pos.y+1)
 
+    @profiling.section
     def choices_at(self, pos, t):
         for choice in self.adjacent_positions(pos):
             if self.map[choice] != '#' and not self.futures[t+1, choice.x, choice.y]:
                     yield choice
 
-    def shortest_path(self, start, target, set_off_at=0):   
-        explored = {(start, set_off_at % self.repeats_after)}
-        queue = deque([(start, set_off_at % self.repeats_after, 0)])
-        while queue:
-            pos, pattern, path_length = queue.popleft()
-            if pos == target:
-                return path_length
-            next_pattern = (set_off_at + path_length+1) % self.repeats_after
-            for neighbour in self.choices_at(pos, next_pattern-1):
-                if (neighbour, next_pattern) not in explored:
-                    explored.add((neighbour, next_pattern))
-                    queue.append((neighbour, next_pattern, path_length+1))
-        raise Exception('No path found')
+    # Search states are numbered (pattern, x, y) -> (pattern*rows + x)*cols + y,
+    # so the explored set is a bitmap over every place at every point in the cycle.
+    def _state(self, pos, pattern):
+        rows, cols = self.map.shape
+        return (pattern*rows + pos.x)*cols + pos.y
+
+    def _next_states(self, state):
+        rows, cols = self.map.shape
+        rest, y = divmod(state, cols)
+        pattern, x = divmod(rest, rows)
+        next_pattern = (pattern+1) % self.repeats_after
+        return [self._state(choice, next_pattern) for choice in self.choices_at(Pos(x, y), pattern)]
+
+    @profiling.section
+    def shortest_path(self, start, target, set_off_at=0):
+        rows, cols = self.map.shape
+        target_place = target.x*cols + target.y
+        path_length = search.shortest_path_length(
+            [self._state(start, set_off_at % self.repeats_after)],
+            self._next_states,
+            lambda state: state % (rows*cols) == target_place,
+            self.repeats_after * rows * cols)
+        if path_length is None:
+            raise Exception('No path found')
+        return path_length
+
+
+# There, back to the start for the snacks, and there again.
+@cache.keyed_on_input
+def triple_trip(path):
+    valley = Valley(fetch_data(path))
+    trip1 = valley.shortest_path(valley.entrance, valley.exit)
+    trip2 = valley.shortest_path(valley.exit, valley.entrance, set_off_at=trip1)
+    trip3 = valley.shortest_path(valley.entrance, valley.exit, set_off_at=trip1+trip2)
+    return trip1 + trip2 + trip3
 
 
 #--------------------- tests -------------------------#
@@ -110,16 +134,12 @@ def test_triple_trip():
     trip3 = valley.shortest_path(valley.entrance, valley.exit, set_off_at=trip1+trip2)
     assert trip3 == 13
 
+def test_triple_trip_from_file():
+    # Skip the result cache, we want to check the calculation.
+    assert triple_trip.__wrapped__('sample_data/day24-complex.txt') == 54
 
-#-----------------------------------------------------#
 
-def shortest_path():
-    data = fetch_data('data/day24.txt')
-    valley = Valley(data)
-    trip1 = valley.shortest_path(valley.entrance, valley.exit)
-    trip2 = valley.shortest_path(valley.exit, valley.entrance, set_off_at=trip1)
-    trip3 = valley.shortest_path(valley.entrance, valley.exit, set_off_at=trip1+trip2)
-    print(trip1+trip2+trip3)
+#-----------------------------------------------------#
 
 if __name__ == "__main__":
-    cProfile.run('shortest_path()', sort='cumulative')
+    print(triple_trip('data/day24.txt'))
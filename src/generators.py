@@ -0,0 +1,426 @@
+# Deterministic, seeded input generators for each day's puzzle format.
+# At scale=1 each one makes something about the size of a real puzzle input,
+# and the size grows roughly linearly with scale (10x, 100x, 1000x...).
+
+import math
+import random
+import string
+
+def _names(rng, n, length, alphabet=string.ascii_lowercase):
+    # n distinct names, each `length` chars long.
+    picks = rng.sample(range(len(alphabet) ** length), n)
+    names = []
+    for p in picks:
+        name = ''
+        for _ in range(length):
+            p, c = divmod(p, len(alphabet))
+            name += alphabet[c]
+        names.append(name)
+    return names
+
+
+def calorie_lists(rng, scale):
+    elves = []
+    for _ in range(250 * scale):
+        items = [str(rng.randint(1000, 60000)) for _ in range(rng.randint(1, 15))]
+        elves.append('\n'.join(items))
+    return '\n\n'.join(elves) + '\n'
+
+
+def strategy_guide(rng, scale):
+    return ''.join(f'{rng.choice("ABC")} {rng.choice("XYZ")}\n' for _ in range(2500 * scale))
+
+
+def rucksacks(rng, scale):
+    # Each elf gets its own 17 letters plus the group's badge, so the badge is the
+    # only item all three share. Each rucksack has exactly one item in both halves.
+    lines = []
+    for _ in range(100 * scale):
+        items = list(string.ascii_letters)
+        rng.shuffle(items)
+        badge = items.pop()
+        for elf in range(3):
+            own = items[elf*17:(elf+1)*17]
+            common, left_pool, right_pool = own[0], own[1:9], own[9:]
+            half = rng.randint(4, 24)
+            left = [common, badge] + rng.choices(left_pool, k=half-2)
+            right = [common] + rng.choices(right_pool, k=half-1)
+            rng.shuffle(left)
+            rng.shuffle(right)
+            lines.append(''.join(left + right))
+    return '\n'.join(lines) + '\n'
+
+
+def section_assignments(rng, scale):
+    lines = []
+    for _ in range(1000 * scale):
+        a, b = sorted(rng.randint(1, 99) for _ in range(2))
+        c, d = sorted(rng.randint(1, 99) for _ in range(2))
+        lines.append(f'{a}-{b},{c}-{d}')
+    return '\n'.join(lines) + '\n'
+
+
+def crate_stacks(rng, scale):
+    stacks = [[rng.choice(string.ascii_uppercase) for _ in range(rng.randint(2, 8 * scale))] for _ in range(9)]
+
+    drawing = []
+    for level in reversed(range(max(len(s) for s in stacks))):
+        drawing.append(' '.join(f'[{s[level]}]' if level < len(s) else '   ' for s in stacks).rstrip())
+    drawing.append(' '.join(f' {n} ' for n in range(1, 10)))
+
+    # Never empty a stack, so every stack still has a top crate at the end.
+    heights = [len(s) for s in stacks]
+    moves = []
+    for _ in range(500 * scale):
+        from_stack = rng.choice([i for i, h in enumerate(heights) if h > 1])
+        to_stack = rng.choice([i for i in range(9) if i != from_stack])
+        count = rng.randint(1, min(heights[from_stack] - 1, 10 * scale))
+        heights[from_stack] -= count
+        heights[to_stack] += count
+        moves.append(f'move {count} from {from_stack+1} to {to_stack+1}')
+    return '\n'.join(drawing) + '\n\n' + '\n'.join(moves) + '\n'
+
+
+def signal(rng, scale):
+    # Only 12 letters until the very end, so the 14-char marker is the last thing in the stream.
+    body = rng.choices(string.ascii_lowercase[:12], k=4096 * scale)
+    return ''.join(body) + ''.join(rng.sample(string.ascii_lowercase, 14)) + '\n'
+
+
+def terminal_output(rng, scale):
+    n_dirs = 180 * scale
+    names = _names(rng, n_dirs, 6)
+    children = [[] for _ in range(n_dirs)]
+    for d in range(1, n_dirs):
+        children[rng.randrange(d)].append(d)
+
+    lines = ['$ cd /']
+    stack = [0]
+    while stack:
+        d = stack.pop()
+        if d is None:
+            lines.append('$ cd ..')
+            continue
+        if d:
+            lines.append(f'$ cd {names[d]}')
+        lines.append('$ ls')
+        lines.extend(f'dir {names[c]}' for c in children[d])
+        for f in range(rng.randint(0, 4)):
+            lines.append(f'{rng.randint(1000, 300000)} {names[d][:3]}{f}.{rng.choice(["txt", "dat", "log"])}')
+        for c in reversed(children[d]):
+            stack.extend([None, c])
+    return '\n'.join(lines) + '\n'
+
+
+def tree_heights(rng, scale):
+    side = round(99 * math.sqrt(scale))
+    return ''.join(''.join(rng.choices('0123456789', k=side)) + '\n' for _ in range(side))
+
+
+def rope_moves(rng, scale):
+    return ''.join(f'{rng.choice("UDLR")} {rng.randint(1, 20)}\n' for _ in range(2000 * scale))
+
+
+def cpu_program(rng, scale):
+    lines = []
+    for _ in range(160 * scale):
+        if rng.random() < 0.3:
+            lines.append('noop')
+        else:
+            lines.append(f'addx {rng.randint(-20, 20) or 1}')
+    return '\n'.join(lines) + '\n'
+
+
+def monkeys(rng, scale):
+    primes = [2, 3, 5, 7, 11, 13, 17, 19]
+    rng.shuffle(primes)
+    blocks = []
+    for m in range(8):
+        items = ', '.join(str(rng.randint(50, 99)) for _ in range(rng.randint(1, 8) * scale))
+        op = rng.choice(['* old', f'* {rng.randint(2, 19)}', f'+ {rng.randint(1, 8)}', f'+ {rng.randint(1, 8)}'])
+        on_true, on_false = rng.sample([o for o in range(8) if o != m], 2)
+        blocks.append(
+            f'Monkey {m}:\n'
+            f'  Starting items: {items}\n'
+            f'  Operation: new = old {op}\n'
+            f'  Test: divisible by {primes[m]}\n'
+            f'    If true: throw to monkey {on_true}\n'
+            f'    If false: throw to monkey {on_false}\n')
+    return '\n'.join(blocks)
+
+
+def heightmap(rng, scale):
+    # Heights ramp up from left to right. The top row is a clean ramp and the
+    # columns at 'z' have no noise, so there's always a route from S to E.
+    rows = round(41 * math.sqrt(scale))
+    cols = round(160 * math.sqrt(scale))
+    lines = []
+    for x in range(rows):
+        row = []
+        for y in range(cols):
+            h = (26 * y) // cols
+            if x > 0 and h < 25:
+                h = max(0, h - rng.randint(0, 2))
+            row.append(string.ascii_lowercase[h])
+        lines.append(row)
+    lines[rows // 2][0] = 'S'
+    lines[rows // 2][-1] = 'E'
+    return ''.join(''.join(row) + '\n' for row in lines)
+
+
+def _packet(rng, depth):
+    if depth > 3 or rng.random() < 0.4:
+        return str(rng.randint(0, 10))
+    return '[' + ','.join(_packet(rng, depth+1) for _ in range(rng.randint(0, 4))) + ']'
+
+def packet_pairs(rng, scale):
+    pairs = []
+    for _ in range(150 * scale):
+        left = '[' + ','.join(_packet(rng, 1) for _ in range(rng.randint(0, 5))) + ']'
+        right = '[' + ','.join(_packet(rng, 1) for _ in range(rng.randint(0, 5))) + ']'
+        pairs.append(f'{left}\n{right}\n')
+    return '\n'.join(pairs)
+
+
+def rock_paths(rng, scale):
+    depth = round(160 * math.sqrt(scale))
+    lines = []
+    for _ in range(round(150 * math.sqrt(scale))):
+        x, y = rng.randint(500 - depth, 500 + depth), rng.randint(10, depth)
+        points = [(x, y)]
+        for step in range(rng.randint(1, 5)):
+            if step % 2:
+                y = min(depth, max(10, y + rng.randint(-8, 8)))
+            else:
+                x = x + rng.randint(-8, 8)
+            points.append((x, y))
+        lines.append(' -> '.join(f'{x},{y}' for x, y in points))
+    return '\n'.join(lines) + '\n'
+
+
+def sensor_report(rng, scale, row=2000000):
+    # Sensors cluster around `row`, so the amount of coverage on that row grows linearly with scale.
+    lines = []
+    for _ in range(30 * scale):
+        dist = rng.randint(1000, 50000)
+        sx, sy = rng.randint(0, 100000 * scale), row + rng.randint(-dist, dist)
+        dx = rng.randint(-dist, dist)
+        bx, by = sx + dx, sy + rng.choice([-1, 1]) * (dist - abs(dx))
+        lines.append(f'Sensor at x={sx}, y={sy}: closest beacon is at x={bx}, y={by}')
+    return '\n'.join(lines) + '\n'
+
+
+def valve_graph(rng, scale, working_valves=8):
+    # Only the graph grows with scale: the number of valves with a flow rate
+    # stays fixed, since the pressure search is exponential in that.
+    n_valves = 50 * scale
+    names = ['AA'] + [n for n in _names(rng, n_valves, 2, string.ascii_uppercase) if n != 'AA'][:n_valves-1]
+    tunnels = {n: set() for n in names}
+    for i in range(1, len(names)):
+        other = names[rng.randrange(i)]
+        tunnels[names[i]].add(other)
+        tunnels[other].add(names[i])
+    for _ in range(len(names) // 4):
+        a, b = rng.sample(names, 2)
+        tunnels[a].add(b)
+        tunnels[b].add(a)
+
+    rates = {n: 0 for n in names}
+    for n in rng.sample(names[1:], working_valves):
+        rates[n] = rng.randint(2, 25)
+
+    lines = []
+    for n in names:
+        to = sorted(tunnels[n])
+        if len(to) == 1:
+            lines.append(f'Valve {n} has flow rate={rates[n]}; tunnel leads to valve {to[0]}')
+        else:
+            lines.append(f'Valve {n} has flow rate={rates[n]}; tunnels lead to valves {", ".join(to)}')
+    return '\n'.join(lines) + '\n'
+
+
+def jet_pattern(rng, scale):
+    return ''.join(rng.choices('<>', k=1000 * scale)) + '\n'
+
+
+def lava_scan(rng, scale):
+    side = round(20 * scale ** (1/3))
+    n_cubes = 2800 * scale
+    cells = rng.sample(range(side ** 3), min(n_cubes, side ** 3 * 35 // 100))
+    return ''.join(f'{c // (side*side)},{c // side % side},{c % side}\n' for c in cells)
+
+
+def blueprints(rng, scale):
+    lines = []
+    for id in range(1, 2 * scale + 1):
+        lines.append(
+            f'Blueprint {id}: '
+            f'Each ore robot costs {rng.randint(2, 4)} ore. '
+            f'Each clay robot costs {rng.randint(2, 4)} ore. '
+            f'Each obsidian robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} clay. '
+            f'Each geode robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} obsidian.')
+    return '\n'.join(lines) + '\n'
+
+
+def encrypted_file(rng, scale):
+    numbers = [rng.randint(-10000, 10000) or 1 for _ in range(5000 * scale)]
+    numbers[rng.randrange(len(numbers))] = 0
+    return ''.join(f'{n}\n' for n in numbers)
+
+
+def monkey_math(rng, scale):
+    # Build a random expression tree by repeatedly joining two random nodes, which
+    # keeps it shallow. Multiply and divide only ever take a small literal on the right.
+    n_leaves = 1100 * scale
+    names = iter(n for n in _names(rng, 4 * n_leaves, 4) if n not in ('root', 'humn'))
+    jobs = {'humn': str(rng.randint(1, 20))}
+    pool = ['humn']
+    for _ in range(n_leaves - 1):
+        name = next(names)
+        jobs[name] = str(rng.randint(1, 20))
+        pool.append(name)
+    while len(pool) > 1:
+        a = pool.pop(rng.randrange(len(pool)))
+        b = pool.pop(rng.randrange(len(pool)))
+        name = next(names) if pool else 'root'
+        jobs[name] = f'{a} {rng.choice("+-")} {b}'
+        if pool and rng.random() < 0.2:
+            literal, wrapped = next(names), next(names)
+            jobs[literal] = str(rng.randint(2, 9))
+            jobs[wrapped] = f'{name} {rng.choice("*/")} {literal}'
+            name = wrapped
+        pool.append(name)
+    order = list(jobs)
+    rng.shuffle(order)
+    return ''.join(f'{n}: {jobs[n]}\n' for n in order)
+
+
+def monkey_map(rng, scale):
+    # Same net of 50x50 faces as the real puzzle; only the path gets longer with scale.
+    faces = [(0, 1), (0, 2), (1, 1), (2, 0), (2, 1), (3, 0)]
+    size = 50
+    lines = []
+    for x in range(4 * size):
+        row = ''
+        for y in range(3 * size):
+            if (x // size, y // size) in faces:
+                row += '#' if rng.random() < 0.05 and (x, y) != (0, size) else '.'
+            else:
+                row += ' '
+        lines.append(row.rstrip())
+    path = ''.join(f'{rng.randint(1, 50)}{rng.choice("LR")}' for _ in range(2000 * scale)) + '10'
+    return '\n'.join(lines) + '\n\n' + path + '\n'
+
+
+def elf_grove(rng, scale):
+    side = round(70 * math.sqrt(scale))
+    return ''.join(''.join('#' if rng.random() < 0.5 else '.' for _ in range(side)) + '\n' for _ in range(side))
+
+
+def blizzard_valley(rng, scale):
+    # Width is a multiple of height, so the blizzard pattern repeats every `width`
+    # minutes. No up/down blizzards in the entrance and exit columns.
+    height = 25
+    width = 100 * scale
+    lines = ['#.' + '#' * width]
+    for _ in range(height):
+        row = '#'
+        for y in range(1, width + 1):
+            choices = '<>' if y in (1, width) else '<>^v'
+            row += rng.choice(choices) if rng.random() < 0.6 else '.'
+        lines.append(row + '#')
+    lines.append('#' * width + '.#')
+    return '\n'.join(lines) + '\n'
+
+
+def snafu_numbers(rng, scale):
+    lines = []
+    for _ in range(120 * scale):
+        digits = rng.choices('=-012', k=rng.randint(1, 20))
+        digits[0] = rng.choice('12')
+        lines.append(''.join(digits))
+    return '\n'.join(lines) + '\n'
+
+
+GENERATORS = {
+    'day01': calorie_lists,
+    'day02': strategy_guide,
+    'day03': rucksacks,
+    'day04': section_assignments,
+    'day05': crate_stacks,
+    'day06': signal,
+    'day07': terminal_output,
+    'day08': tree_heights,
+    'day09': rope_moves,
+    'day10': cpu_program,
+    'day11': monkeys,
+    'day12': heightmap,
+    'day13': packet_pairs,
+    'day14': rock_paths,
+    'day15': sensor_report,
+    'day16': valve_graph,
+    'day17': jet_pattern,
+    'day18': lava_scan,
+    'day19': blueprints,
+    'day20': encrypted_file,
+    'day21': monkey_math,
+    'day22': monkey_map,
+    'day23': elf_grove,
+    'day24': blizzard_valley,
+    'day25': snafu_numbers,
+}
+
+
+def generate(day, scale=1, seed=2022):
+    rng = random.Random(f'{day}/{scale}/{seed}')
+    return GENERATORS[day](rng, scale)
+
+
+def write_input(path, day, scale=1, seed=2022):
+    with open(path, 'w') as f:
+        f.write(generate(day, scale, seed))
+    return path
+
+
+#--------------------- tests -------------------------#
+
+def test_generate_is_deterministic():
+    for day in GENERATORS:
+        assert generate(day, seed=1) == generate(day, seed=1)
+    assert generate('day01', seed=1) != generate('day01', seed=2)
+
+def test_generate_scales_size():
+    small = generate('day09', scale=1)
+    large = generate('day09', scale=10)
+    assert large.count('\n') == 10 * small.count('\n')
+
+def test_rucksacks_have_one_common_item_and_one_badge():
+    lines = generate('day03').split()
+    for ln in lines:
+        half = len(ln) // 2
+        assert len(set(ln[:half]) & set(ln[half:])) == 1
+    for i in range(0, len(lines), 3):
+        assert len(set(lines[i]) & set(lines[i+1]) & set(lines[i+2])) == 1
+
+def test_terminal_output_visits_every_dir():
+    lines = generate('day07').splitlines()
+    assert lines[0] == '$ cd /'
+    listed = {ln.split()[1] for ln in lines if ln.startswith('dir ')}
+    visited = {ln.split()[2] for ln in lines if ln.startswith('$ cd ') and ln != '$ cd ..'}
+    assert visited == listed | {'/'}
+
+def test_monkey_math_has_root_and_humn():
+    jobs = dict(ln.split(': ') for ln in generate('day21').splitlines())
+    assert len(jobs['root'].split()) == 3
+    assert jobs['humn'].isdecimal()
+    for job in jobs.values():
+        if not job.isdecimal():
+            a, _, b = job.split()
+            assert a in jobs and b in jobs
+
+#-----------------------------------------------------#
+
+if __name__ == "__main__":
+    import sys
+    day, scale = sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    sys.stdout.write(generate(day, scale))
@@ -0,0 +1,199 @@
+# Dense grids backed by a numpy array (uint8 by default), for the days that
+# would otherwise keep a dict or set of coordinate tuples. Works in 2D or 3D.
+# Coordinates can be negative: `origin` is the coordinate of cells[0, 0(, 0)],
+# and setting a cell outside the current extent grows the array (at least
+# doubling along that axis, so repeated growth is amortised).
+
+import numpy as np
+
+ORTHOGONAL_2D = ((-1, 0), (1, 0), (0, -1), (0, 1))
+DIAGONAL_2D = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+ALL_2D = ORTHOGONAL_2D + DIAGONAL_2D
+ORTHOGONAL_3D = ((-1, 0, 0), (1, 0, 0), (0, -1, 0), (0, 1, 0), (0, 0, -1), (0, 0, 1))
+
+
+class Grid:
+    def __init__(self, shape, origin=None, dtype=np.uint8):
+        self.cells = np.zeros(shape, dtype)
+        self.origin = tuple(int(o) for o in origin) if origin is not None else (0,) * len(shape)
+
+    @classmethod
+    def from_points(cls, points, value=1, margin=0, dtype=np.uint8):
+        points = np.array(list(points))
+        low = points.min(axis=0) - margin
+        high = points.max(axis=0) + margin
+        grid = cls(tuple(high - low + 1), origin=low, dtype=dtype)
+        grid.cells[tuple((points - low).T)] = value
+        return grid
+
+    # Lines of single-character cells, e.g. a digit map. `mapping` turns a byte
+    # into a cell value; by default digits become their numeric value.
+    @classmethod
+    def from_lines(cls, lines, mapping=None):
+        rows = [ln.encode() if isinstance(ln, str) else bytes(ln) for ln in lines]
+        cells = np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(len(rows), -1)
+        if mapping is None:
+            cells = cells - ord('0')
+        else:
+            table = np.zeros(256, np.uint8)
+            for char, value in mapping.items():
+                table[ord(char)] = value
+            cells = table[cells]
+        grid = cls(cells.shape)
+        grid.cells = cells
+        return grid
+
+    @property
+    def shape(self):
+        return self.cells.shape
+
+    # Lowest and highest coordinates currently stored (inclusive).
+    def bounds(self):
+        return self.origin, tuple(o + n - 1 for o, n in zip(self.origin, self.cells.shape))
+
+    # Array index of a coordinate.
+    def index(self, pos):
+        return tuple(p - o for p, o in zip(pos, self.origin))
+
+    def contains(self, pos):
+        idx = self.index(pos)
+        return all(0 <= i < n for i, n in zip(idx, self.cells.shape))
+
+    def __getitem__(self, pos):
+        idx = self.index(pos)
+        if all(0 <= i < n for i, n in zip(idx, self.cells.shape)):
+            return self.cells[idx]
+        return 0
+
+    def __setitem__(self, pos, value):
+        self.include(pos)
+        self.cells[self.index(pos)] = value
+
+    # Grows the array, if needed, so pos is inside it.
+    def include(self, pos):
+        idx = self.index(pos)
+        shape = self.cells.shape
+        if all(0 <= i < n for i, n in zip(idx, shape)):
+            return
+        before = [max(-i, n) if i < 0 else 0 for i, n in zip(idx, shape)]
+        after = [max(i - n + 1, n) if i >= n else 0 for i, n in zip(idx, shape)]
+        self.cells = np.pad(self.cells, list(zip(before, after)))
+        self.origin = tuple(o - b for o, b in zip(self.origin, before))
+
+    # Sets every cell in the box from low to high (inclusive).
+    def fill(self, low, high, value):
+        self.include(low)
+        self.include(high)
+        self.cells[tuple(slice(l, h + 1) for l, h in zip(self.index(low), self.index(high)))] = value
+
+    def count(self, value):
+        return int(np.count_nonzero(self.cells == value))
+
+    # Coordinates of every cell where mask is true.
+    def points(self, mask):
+        return [tuple(int(i) for i in p) for p in np.argwhere(mask) + self.origin]
+
+    def packed(self):
+        return np.packbits(self.cells.astype(bool), axis=-1)
+
+
+# mask moved by offset; cells shifted in from outside the array are `fill`.
+def shifted(mask, offset, fill=False):
+    result = np.full_like(mask, fill)
+    src = []
+    dst = []
+    for d, n in zip(offset, mask.shape):
+        if d >= 0:
+            src.append(slice(0, n - d))
+            dst.append(slice(d, n))
+        else:
+            src.append(slice(-d, n))
+            dst.append(slice(0, n + d))
+    result[tuple(dst)] = mask[tuple(src)]
+    return result
+
+
+# For each cell, how many of its neighbours (at the given offsets) are set in mask.
+def neighbour_count(mask, offsets):
+    counts = np.zeros(mask.shape, np.uint8)
+    for offset in offsets:
+        counts += shifted(mask, offset)
+    return counts
+
+
+# Cells of `allowed` reachable from `start` through neighbour offsets. Grows a
+# whole frontier at a time, so it's array work rather than a queue of tuples.
+def flood_fill(allowed, start, offsets):
+    filled = np.zeros(allowed.shape, bool)
+    filled[start] = allowed[start]
+    frontier = filled.copy()
+    while frontier.any():
+        grown = np.zeros(allowed.shape, bool)
+        for offset in offsets:
+            grown |= shifted(frontier, offset)
+        frontier = grown & allowed & ~filled
+        filled |= frontier
+    return filled
+
+
+#--------------------- tests -------------------------#
+
+def test_get_and_set():
+    grid = Grid((3, 3))
+    grid[1, 2] = 5
+    assert grid[1, 2] == 5
+    assert grid[0, 0] == 0
+    assert grid[10, 10] == 0
+    assert grid.cells.dtype == np.uint8
+
+def test_grows_with_negative_coordinates():
+    grid = Grid((2, 2))
+    grid[-3, 1] = 1
+    grid[1, 7] = 2
+    assert grid[-3, 1] == 1
+    assert grid[1, 7] == 2
+    assert grid.bounds()[0] == (-3, 0)
+    assert grid.shape[0] >= 5 and grid.shape[1] >= 8
+
+def test_fill():
+    grid = Grid((1, 1), origin=(500, 0))
+    grid.fill((498, 4), (498, 6), 1)
+    grid.fill((496, 6), (498, 6), 1)
+    assert grid.count(1) == 5
+    assert grid.points(grid.cells == 1)[0] == (496, 6)
+
+def test_from_points_3d():
+    grid = Grid.from_points([(1, 1, 1), (2, 1, 1)], margin=1)
+    assert grid.bounds() == ((0, 0, 0), (3, 2, 2))
+    assert grid[2, 1, 1] == 1
+    assert grid.count(1) == 2
+
+def test_from_lines():
+    grid = Grid.from_lines(['30373', '25512'])
+    assert grid.cells.tolist() == [[3, 0, 3, 7, 3], [2, 5, 5, 1, 2]]
+    grid = Grid.from_lines(['#.', '.#'], mapping={'#': 1})
+    assert grid.cells.tolist() == [[1, 0], [0, 1]]
+
+def test_neighbour_count():
+    mask = np.array([
+        [1, 1, 0],
+        [0, 1, 0],
+        [0, 0, 0]], bool)
+    assert neighbour_count(mask, ORTHOGONAL_2D).tolist() == [
+        [1, 2, 1],
+        [2, 1, 1],
+        [0, 1, 0]]
+    assert neighbour_count(mask, ALL_2D)[2, 2] == 1
+
+def test_flood_fill():
+    allowed = np.array([
+        [1, 1, 0, 1],
+        [0, 1, 0, 1],
+        [1, 1, 0, 1]], bool)
+    assert flood_fill(allowed, (0, 0), ORTHOGONAL_2D).sum() == 5
+
+def test_packed():
+    grid = Grid.from_lines(['10000001'])
+    assert grid.packed().tolist() == [[0b10000001]]
+
+#-----------------------------------------------------#
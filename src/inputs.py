@@ -0,0 +1,152 @@
+# Shared input reading for the fetch_data functions. The file is memory-mapped
+# and handled as bytes, so there's no decoding into str unless a day wants it,
+# and number extraction runs straight over the mapped file.
+
+import mmap
+import re
+from contextlib import contextmanager
+
+UNSIGNED = re.compile(rb'\d+')
+SIGNED = re.compile(rb'-?\d+')
+
+
+@contextmanager
+def mapped(path):
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be mapped.
+            yield b''
+            return
+        with mm:
+            yield mm
+
+
+# Each line as bytes, without its line ending.
+def lines(path):
+    with mapped(path) as mm:
+        if not mm:
+            return
+        for ln in iter(mm.readline, b''):
+            yield ln.rstrip(b'\r\n')
+
+
+# Blank-line separated blocks of lines, as bytes joined with b'\n'. A line
+# that's only whitespace (or a bare \r) counts as blank.
+def records(path):
+    block = []
+    for ln in lines(path):
+        if ln.strip():
+            block.append(ln)
+        elif block:
+            yield b'\n'.join(block)
+            block = []
+    if block:
+        yield b'\n'.join(block)
+
+
+# Every number in the file, in order.
+def ints(path, signed=False):
+    pattern = SIGNED if signed else UNSIGNED
+    with mapped(path) as mm:
+        for m in pattern.finditer(mm):
+            yield int(m[0])
+
+
+# The whole file as a numpy uint8 array, for the days that work on every byte
+# at once. Unlike the functions above this isn't zero-copy: an array can't
+# outlive the mapping it views, so the file is read into one (a single read,
+# straight into the array).
+def byte_array(path):
+    import numpy as np
+    return np.fromfile(path, np.uint8)
+
+
+# Every (unsigned) number in the file as a numpy int64 array.
+def int_array(path):
+    return digit_runs(byte_array(path))[2]
+
+
+# Finds each run of digits in a numpy byte array, and the number it spells,
+# without a Python loop over the runs: the k-th digit from the end of every
+# run is picked out together and is worth 10**k. Returns (starts, ends,
+# numbers), with ends exclusive.
+def digit_runs(buf):
+    import numpy as np
+    is_digit = (buf >= ord('0')) & (buf <= ord('9'))
+    edges = np.flatnonzero(np.diff(is_digit.astype(np.int8), prepend=0, append=0))
+    starts, ends = edges[0::2], edges[1::2]
+    lengths = ends - starts
+    numbers = np.zeros(len(starts), np.int64)
+    for k in range(int(lengths.max(initial=0))):
+        # Runs shorter than k+1 pick up a byte from before them, which is then zeroed.
+        digits = buf[ends - 1 - k] - np.uint8(ord('0'))
+        digits[lengths <= k] = 0
+        numbers += digits * np.int64(10**k)
+    return starts, ends, numbers
+
+
+# Every number in one line (or record).
+def ints_in(ln, signed=False):
+    pattern = SIGNED if signed else UNSIGNED
+    return [int(n) for n in pattern.findall(ln)]
+
+
+#--------------------- tests -------------------------#
+
+def test_lines():
+    data = lines('sample_data/day09.txt')
+    assert next(data) == b'R 4'
+    assert len(list(data)) == 7
+
+def test_lines_keeps_blank_lines():
+    data = list(lines('sample_data/day01.txt'))
+    assert data[:4] == [b'1000', b'2000', b'3000', b'']
+
+def test_records():
+    data = list(records('sample_data/day01.txt'))
+    assert data[0] == b'1000\n2000\n3000'
+    assert data[-1] == b'10000'
+    assert len(data) == 5
+
+def test_records_with_crlf_and_whitespace_separators(tmp_path):
+    path = tmp_path / 'records.txt'
+    path.write_bytes(b'1000\r\n2000\r\n\r\n3000\r\n \t\r\n\n4000\r\n')
+    assert list(records(path)) == [b'1000\n2000', b'3000', b'4000']
+
+def test_ints():
+    assert list(ints('sample_data/day04.txt'))[:4] == [2, 4, 6, 8]
+    assert list(ints('sample_data/day20.txt', signed=True)) == [1, 2, -3, 3, -2, 0, 4]
+
+def test_int_array(tmp_path):
+    assert int_array('sample_data/day04.txt').tolist()[:4] == [2, 4, 6, 8]
+    assert int_array('sample_data/day04.txt').tolist() == list(ints('sample_data/day04.txt'))
+    path = tmp_path / 'empty.txt'
+    path.write_bytes(b'')
+    assert int_array(path).tolist() == []
+
+def test_byte_array(tmp_path):
+    assert bytes(byte_array('sample_data/day06.txt')).rstrip() == b'mjqjpqmgbljsphdztnvjfqwrcgsmlb'
+    path = tmp_path / 'empty.txt'
+    path.write_bytes(b'')
+    assert byte_array(path).size == 0
+
+def test_digit_runs():
+    import numpy as np
+    starts, ends, numbers = digit_runs(np.frombuffer(b'a12,3\n456', np.uint8))
+    assert starts.tolist() == [1, 4, 6]
+    assert ends.tolist() == [3, 5, 9]
+    assert numbers.tolist() == [12, 3, 456]
+
+def test_ints_in():
+    assert ints_in(b'2-4,6-8') == [2, 4, 6, 8]
+    assert ints_in(b'x=-2, y=15', signed=True) == [-2, 15]
+
+def test_empty_file(tmp_path):
+    path = tmp_path / 'empty.txt'
+    path.write_bytes(b'')
+    assert list(lines(path)) == []
+    assert list(ints(path)) == []
+
+#-----------------------------------------------------#
@@ -0,0 +1,197 @@
+# Inclusive integer ranges like (low, high), and sets of them. An IntervalSet
+# keeps its ranges sorted and merged (touching ranges join up too, since these
+# are whole numbers), so its size and gaps come from the few ranges it holds
+# rather than from every number they cover.
+
+import math
+from bisect import bisect_left, bisect_right
+
+
+def overlaps(first_low, first_high, second_low, second_high):
+    return first_low <= second_high and second_low <= first_high
+
+def contains(outer_low, outer_high, inner_low, inner_high):
+    return outer_low <= inner_low and inner_high <= outer_high
+
+
+class IntervalSet:
+    def __init__(self, intervals=()):
+        self.lows = []
+        self.highs = []
+        for low, high in sorted(intervals):
+            if self.highs and low <= self.highs[-1] + 1:
+                self.highs[-1] = max(self.highs[-1], high)
+            else:
+                self.lows.append(low)
+                self.highs.append(high)
+
+    def add(self, low, high):
+        # Every stored range from first to last (exclusive) touches the new one.
+        first = bisect_left(self.highs, low - 1)
+        last = bisect_right(self.lows, high + 1)
+        if first < last:
+            low = min(low, self.lows[first])
+            high = max(high, self.highs[last-1])
+        self.lows[first:last] = [low]
+        self.highs[first:last] = [high]
+
+    def __iter__(self):
+        return zip(self.lows, self.highs)
+
+    # How many numbers are covered.
+    def __len__(self):
+        return sum(self.highs) - sum(self.lows) + len(self.lows)
+
+    def __contains__(self, x):
+        i = bisect_right(self.lows, x) - 1
+        return i >= 0 and x <= self.highs[i]
+
+    # The stored range that x falls in, or None.
+    def stab(self, x):
+        i = bisect_right(self.lows, x) - 1
+        if i >= 0 and x <= self.highs[i]:
+            return self.lows[i], self.highs[i]
+
+    def overlaps(self, low, high):
+        i = bisect_left(self.highs, low)
+        return i < len(self.lows) and self.lows[i] <= high
+
+    # The ranges between low and high that aren't covered.
+    def gaps(self, low, high):
+        start = low
+        for i in range(bisect_left(self.highs, low), len(self.lows)):
+            if self.lows[i] > high:
+                break
+            if self.lows[i] > start:
+                yield start, self.lows[i] - 1
+            start = self.highs[i] + 1
+        if start <= high:
+            yield start, high
+
+
+# A fixed collection of ranges (overlapping each other or not, unlike an
+# IntervalSet), indexed for "which of them overlap this range" queries. Ranges
+# are sorted by their low end, with a tree of the biggest high end below each
+# node, so a search skips any part of the tree that ends too early: it costs
+# O(log n) per range found rather than a look at every range.
+class RangeIndex:
+    def __init__(self, ranges):
+        self.ranges = list(ranges)
+        self.order = sorted(range(len(self.ranges)), key=self.ranges.__getitem__)
+        self.lows = [self.ranges[i][0] for i in self.order]
+        self.size = 1
+        while self.size < len(self.order):
+            self.size *= 2
+        # max_high[node] for a heap-style tree; leaves start at self.size.
+        self.max_high = [-math.inf] * (2 * self.size)
+        self.max_high[self.size:self.size + len(self.order)] = [self.ranges[i][1] for i in self.order]
+        # A level at a time: nodes width..2*width-1 have children 2*width..4*width-1.
+        tree = self.max_high
+        width = self.size // 2
+        while width:
+            tree[width:2*width] = map(max, tree[2*width:4*width:2], tree[2*width+1:4*width:2])
+            width //= 2
+
+    def __len__(self):
+        return len(self.ranges)
+
+    # Positions (in the list given to the constructor) of every range that
+    # overlaps low-high, in order of their low ends.
+    def overlapping(self, low, high):
+        # Only ranges starting by `high` can overlap; of those, we want the ones ending at or after `low`.
+        candidates = bisect_right(self.lows, high)
+        found = []
+        stack = [(1, 0, self.size)]
+        while stack:
+            node, start, stop = stack.pop()
+            if start >= candidates or self.max_high[node] < low:
+                continue
+            if node >= self.size:
+                found.append(self.order[start])
+            else:
+                middle = (start + stop) // 2
+                stack.append((2*node + 1, middle, stop))
+                stack.append((2*node, start, middle))
+        return found
+
+    # How many pairs of the ranges overlap each other. Two ranges don't
+    # overlap just when one ends before the other starts, and for each range
+    # the ones ending before it starts can be counted with a binary search.
+    def count_overlapping_pairs(self):
+        highs = sorted(high for _, high in self.ranges)
+        apart = sum(bisect_left(highs, low) for low, _ in self.ranges)
+        n = len(self.ranges)
+        return n * (n - 1) // 2 - apart
+
+
+#--------------------- tests -------------------------#
+
+def test_overlaps_and_contains():
+    assert overlaps(5, 7, 7, 9)
+    assert not overlaps(2, 3, 4, 5)
+    assert contains(2, 8, 3, 7)
+    assert not contains(3, 7, 2, 8)
+
+def test_merges_on_construction():
+    intervals = IntervalSet([(12, 12), (2, 14), (16, 24), (15, 15), (-2, 2)])
+    assert list(intervals) == [(-2, 24)]
+    assert len(intervals) == 27
+
+def test_add():
+    intervals = IntervalSet()
+    intervals.add(10, 20)
+    intervals.add(30, 40)
+    intervals.add(0, 5)
+    assert list(intervals) == [(0, 5), (10, 20), (30, 40)]
+    intervals.add(21, 22)
+    assert list(intervals) == [(0, 5), (10, 22), (30, 40)]
+    intervals.add(4, 35)
+    assert list(intervals) == [(0, 40)]
+    intervals.add(12, 13)
+    assert list(intervals) == [(0, 40)]
+
+def test_add_matches_construction():
+    import random
+    rng = random.Random(15)
+    ranges = [(low, low + rng.randrange(10)) for low in (rng.randrange(200) for _ in range(50))]
+    one_at_a_time = IntervalSet()
+    for low, high in ranges:
+        one_at_a_time.add(low, high)
+    assert list(one_at_a_time) == list(IntervalSet(ranges))
+    assert len(one_at_a_time) == len({x for low, high in ranges for x in range(low, high + 1)})
+
+def test_queries():
+    intervals = IntervalSet([(0, 5), (10, 20)])
+    assert 5 in intervals and 10 in intervals
+    assert 7 not in intervals and -1 not in intervals and 21 not in intervals
+    assert intervals.stab(12) == (10, 20)
+    assert intervals.stab(8) is None
+    assert intervals.overlaps(6, 10)
+    assert not intervals.overlaps(6, 9)
+    assert not intervals.overlaps(21, 30)
+
+def test_gaps():
+    intervals = IntervalSet([(0, 5), (10, 20)])
+    assert list(intervals.gaps(0, 20)) == [(6, 9)]
+    assert list(intervals.gaps(-3, 25)) == [(-3, -1), (6, 9), (21, 25)]
+    assert list(intervals.gaps(2, 4)) == []
+    assert list(IntervalSet().gaps(1, 2)) == [(1, 2)]
+
+def test_range_index():
+    ranges = [(2, 4), (6, 8), (2, 3), (4, 5), (6, 6), (2, 8), (3, 7)]
+    index = RangeIndex(ranges)
+    for low, high in [(4, 4), (1, 1), (9, 12), (5, 6), (0, 100)]:
+        expected = {i for i, r in enumerate(ranges) if overlaps(low, high, *r)}
+        assert set(index.overlapping(low, high)) == expected
+    assert index.overlapping(4, 4) == [0, 5, 6, 3]
+
+def test_count_overlapping_pairs():
+    import random
+    rng = random.Random(4)
+    ranges = [(low, low + rng.randrange(20)) for low in (rng.randrange(100) for _ in range(60))]
+    expected = sum(overlaps(*ranges[i], *ranges[j]) for i in range(len(ranges)) for j in range(i + 1, len(ranges)))
+    assert RangeIndex(ranges).count_overlapping_pairs() == expected
+    assert RangeIndex([]).count_overlapping_pairs() == 0
+    assert RangeIndex([]).overlapping(1, 2) == []
+
+#-----------------------------------------------------#
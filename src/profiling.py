@@ -0,0 +1,223 @@
+# Opt-in timing for named hot sections of the solvers, instead of wrapping a
+# whole run in cProfile. Mark a function with @profiling.section, or a block
+# with `with profiling.measure('name'):`. Sections only do anything when
+# AOC_PROFILE is set as the solver module is imported, so normal runs pay nothing.
+#
+#   python src/profiling.py run day23-faster --json after.json
+#   python src/profiling.py compare before.json after.json
+
+import functools
+import inspect
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# Solvers import this module, so it keeps its own imports light: the
+# command line's extra modules are only loaded when it's run as a script.
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class SectionStats:
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        # Net change in allocated memory blocks while the section was running.
+        self.allocated_blocks = 0
+        self._depth = 0
+
+    def as_dict(self):
+        return {'calls': self.calls, 'seconds': self.seconds, 'allocated_blocks': self.allocated_blocks}
+
+
+class Profiler:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.sections = {}
+
+    def _stats(self, name):
+        if name not in self.sections:
+            self.sections[name] = SectionStats()
+        return self.sections[name]
+
+    @contextmanager
+    def measure(self, name):
+        if not self.enabled:
+            yield
+            return
+        stats = self._stats(name)
+        stats.calls += 1
+        # Only time the outermost call, so recursion isn't counted twice.
+        stats._depth += 1
+        if stats._depth > 1:
+            try:
+                yield
+            finally:
+                stats._depth -= 1
+            return
+        blocks_before = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.seconds += time.perf_counter() - start
+            stats.allocated_blocks += sys.getallocatedblocks() - blocks_before
+            stats._depth -= 1
+
+    # Use as @section, or @section('name') to pick the name (defaults to the function's qualified name).
+    def section(self, fn=None, name=None):
+        if isinstance(fn, str):
+            fn, name = None, fn
+        if fn is None:
+            return lambda f: self.section(f, name)
+        if not self.enabled:
+            return fn
+
+        name = name or fn.__qualname__
+        if inspect.isgeneratorfunction(fn):
+            # Calling it only makes the generator: the work happens as it's consumed.
+            @functools.wraps(fn)
+            def generator_wrapper(*args, **kwargs):
+                with self.measure(name):
+                    yield from fn(*args, **kwargs)
+            return generator_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self.measure(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def report(self):
+        return {name: stats.as_dict() for name, stats in sorted(self.sections.items())}
+
+    def reset(self):
+        self.sections = {}
+
+
+# Sections that got slower (by more than `tolerance` as a fraction) or got
+# more calls between two reports. Returns (name, field, before, after) tuples.
+def compare(before, after, tolerance=0.2):
+    regressions = []
+    for name, new in after.items():
+        old = before.get(name)
+        if old is None:
+            continue
+        if new['calls'] > old['calls']:
+            regressions.append((name, 'calls', old['calls'], new['calls']))
+        if new['seconds'] > old['seconds'] * (1 + tolerance):
+            regressions.append((name, 'seconds', old['seconds'], new['seconds']))
+    return regressions
+
+
+profiler = Profiler(enabled=bool(os.environ.get('AOC_PROFILE')))
+section = profiler.section
+measure = profiler.measure
+
+
+#--------------------- tests -------------------------#
+
+def test_section_counts_calls_and_time():
+    p = Profiler()
+
+    @p.section
+    def work(n):
+        return [i for i in range(n)]
+
+    work(10)
+    work(10)
+    report = p.report()
+    assert report['test_section_counts_calls_and_time.<locals>.work']['calls'] == 2
+    assert report['test_section_counts_calls_and_time.<locals>.work']['seconds'] > 0
+
+def test_named_section_and_measure():
+    p = Profiler()
+
+    @p.section('Field.propose_move')
+    def propose():
+        return 1
+
+    propose()
+    with p.measure('setup'):
+        pass
+    assert set(p.report()) == {'Field.propose_move', 'setup'}
+
+def test_recursion_counted_once():
+    p = Profiler()
+
+    @p.section('fib')
+    def fib(n):
+        return n if n < 2 else fib(n-1) + fib(n-2)
+
+    fib(10)
+    assert p.report()['fib']['calls'] == 177
+    assert p.sections['fib']._depth == 0
+
+def test_generator_section_times_iteration():
+    p = Profiler()
+
+    @p.section('slow_choices')
+    def slow_choices(n):
+        for i in range(n):
+            time.sleep(0.001)
+            yield i
+
+    choices = slow_choices(5)
+    assert 'slow_choices' not in p.report()
+    assert list(choices) == [0, 1, 2, 3, 4]
+    report = p.report()['slow_choices']
+    assert report['calls'] == 1
+    assert report['seconds'] >= 0.005
+
+def test_disabled_profiler_leaves_function_alone():
+    p = Profiler(enabled=False)
+    def work():
+        return 1
+    assert p.section(work) is work
+    assert p.section('name')(work) is work
+    with p.measure('block'):
+        pass
+    assert p.report() == {}
+
+def test_compare():
+    before = {'a': {'calls': 10, 'seconds': 1.0}, 'b': {'calls': 5, 'seconds': 1.0}}
+    after = {'a': {'calls': 10, 'seconds': 1.1}, 'b': {'calls': 6, 'seconds': 2.0}, 'c': {'calls': 1, 'seconds': 9}}
+    assert compare(before, after) == [('b', 'calls', 5, 6), ('b', 'seconds', 1.0, 2.0)]
+
+#-----------------------------------------------------#
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import runpy
+
+    parser = argparse.ArgumentParser(description='Profile the marked sections of a day solver, or compare two profiles.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run_parser = subparsers.add_parser('run', help="Run a day's main block with profiling on")
+    run_parser.add_argument('day', help='e.g. day23-faster')
+    run_parser.add_argument('--json', help='Write the section report here')
+    compare_parser = subparsers.add_parser('compare', help='Show sections that regressed between two reports')
+    compare_parser.add_argument('before')
+    compare_parser.add_argument('after')
+    compare_parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        os.environ['AOC_PROFILE'] = '1'
+        import profiling    # A fresh import, so it picks up the setting. The day module will share it.
+        runpy.run_path(os.path.join(SRC_DIR, f'{args.day}.py'), run_name='__main__')
+        report = profiling.profiler.report()
+        for name, stats in report.items():
+            print(f"{name:<30} {stats['calls']:>10} calls {stats['seconds']:10.3f}s {stats['allocated_blocks']:>10} blocks")
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=2)
+    else:
+        with open(args.before) as f:
+            before = json.load(f)
+        with open(args.after) as f:
+            after = json.load(f)
+        regressions = compare(before, after, args.tolerance)
+        for name, field, old, new in regressions:
+            print(f'{name}: {field} went from {old} to {new}')
+        sys.exit(1 if regressions else 0)
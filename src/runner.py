@@ -0,0 +1,133 @@
+import importlib.util
+import io
+import os
+import re
+import resource
+import runpy
+import sys
+import time
+import traceback
+from collections import namedtuple
+from contextlib import redirect_stdout
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DayResult = namedtuple("DayResult", "name output error wall_time cpu_time peak_rss_kb")
+
+
+# Finds every solver script, including variants like 'day22-part2' or 'day23-faster'.
+def discover_days(src_dir=SRC_DIR):
+    days = []
+    for filename in os.listdir(src_dir):
+        if re.fullmatch(r'day\d\d(-[\w-]+)?\.py', filename):
+            days.append(os.path.join(src_dir, filename))
+    return sorted(days)
+
+
+def day_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+# Imports a day's module by name. Works for the hyphenated ones too, which a plain import can't reach.
+def load_day(name, src_dir=SRC_DIR):
+    spec = importlib.util.spec_from_file_location(name.replace('-', '_'), os.path.join(src_dir, f'{name}.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Runs one day's script as if it was launched from the command line, capturing what it prints.
+# Each call gets a fresh worker process (see run_all), so ru_maxrss is that day's own peak.
+def run_day(path):
+    output = io.StringIO()
+    error = None
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    if os.path.dirname(path) not in sys.path:
+        sys.path.insert(0, os.path.dirname(path))
+    try:
+        with redirect_stdout(output):
+            runpy.run_path(path, run_name='__main__')
+    except BaseException:
+        error = traceback.format_exc(limit=-1).rstrip()
+    wall_time = time.perf_counter() - wall_start
+    cpu_time = time.process_time() - cpu_start
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return DayResult(day_name(path), output.getvalue(), error, wall_time, cpu_time, peak_rss_kb)
+
+
+# Yields a DayResult for each path as soon as it's done, so the whole batch
+# takes about as long as the slowest day rather than the sum of them all.
+def run_all(paths, workers=None):
+    # Slow imports wait for the code that needs them (see the README).
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    if workers is None:
+        workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        futures = [pool.submit(run_day, p) for p in paths]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def format_result(result):
+    status = 'ok' if result.error is None else 'FAILED'
+    return (f'{result.name:<14} {status:<6} wall {result.wall_time:8.2f}s  '
+            f'cpu {result.cpu_time:8.2f}s  peak rss {result.peak_rss_kb / 1024:8.1f} MB')
+
+
+#--------------------- tests -------------------------#
+
+def test_discover_days():
+    names = [day_name(p) for p in discover_days()]
+    assert names[0] == 'day01'
+    assert 'day22-part2' in names
+    assert 'day23-faster' in names
+    assert '_day' not in names
+    assert 'runner' not in names
+
+def test_load_day():
+    day23_faster = load_day('day23-faster')
+    assert day23_faster.Field is not None
+    assert load_day('day01').get_sum_of_top_elves([1, 5, 3], 2) == 8
+
+def test_run_day_captures_output():
+    result = run_day(os.path.join(SRC_DIR, '_day.py'))
+    assert result.name == '_day'
+    assert result.error is None
+    assert result.output == 'Hello, World!\n'
+    assert result.wall_time >= 0
+    assert result.peak_rss_kb > 0
+
+def test_run_day_reports_errors(tmp_path):
+    script = tmp_path / 'day99.py'
+    script.write_text("raise ValueError('no data')\n")
+    result = run_day(str(script))
+    assert result.name == 'day99'
+    assert 'ValueError: no data' in result.error
+
+def test_run_all():
+    results = list(run_all([os.path.join(SRC_DIR, '_day.py')] * 2, workers=2))
+    assert len(results) == 2
+    assert all(r.output == 'Hello, World!\n' for r in results)
+
+#-----------------------------------------------------#
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Run all the day solvers in parallel.')
+    parser.add_argument('days', nargs='*', help='Only run these days, e.g. day01 day22-part2')
+    parser.add_argument('--workers', type=int, default=None, help='Defaults to the number of cores')
+    args = parser.parse_args()
+
+    paths = discover_days()
+    if args.days:
+        paths = [p for p in paths if day_name(p) in args.days]
+
+    batch_start = time.perf_counter()
+    for result in run_all(paths, args.workers):
+        print(format_result(result))
+        for ln in result.output.splitlines():
+            print(f'    {ln}')
+        if result.error:
+            print(f'    {result.error.splitlines()[-1]}')
+    print(f'Total wall time: {time.perf_counter() - batch_start:.2f}s')
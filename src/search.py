@@ -0,0 +1,198 @@
+# Graph searches over integer-encoded states. If you know how many states there
+# can be, pass n_states and visited states are kept in a preallocated bitmap;
+# otherwise (n_states=None) any hashable state works and a set is used.
+#
+# `neighbours(state)` gives the states one step away (for dijkstra/astar it gives
+# (state, cost) pairs). Search in reverse by passing a neighbours function that
+# follows the edges backwards. Every search takes a list of sources, so
+# multi-source searches come for free.
+
+import heapq
+from array import array
+
+
+class Bitmap(bytearray):
+    __contains__ = bytearray.__getitem__
+
+    def add(self, state):
+        self[state] = 1
+
+
+def visited_states(n_states=None):
+    return set() if n_states is None else Bitmap(n_states)
+
+
+# Every state reachable from the sources, each yielded once, in breadth first order.
+def reachable(sources, neighbours, n_states=None):
+    seen = visited_states(n_states)
+    frontier = []
+    for s in sources:
+        if s not in seen:
+            seen.add(s)
+            frontier.append(s)
+    while frontier:
+        next_frontier = []
+        for state in frontier:
+            yield state
+            for n in neighbours(state):
+                if n not in seen:
+                    seen.add(n)
+                    next_frontier.append(n)
+        frontier = next_frontier
+
+
+def _expand(frontier, neighbours, seen):
+    next_frontier = []
+    for state in frontier:
+        for n in neighbours(state):
+            if n not in seen:
+                seen.add(n)
+                next_frontier.append(n)
+    return next_frontier
+
+
+# Number of steps from the nearest source to the nearest target, or None if there's no way.
+def shortest_path_length(sources, neighbours, is_target, n_states=None):
+    seen = visited_states(n_states)
+    frontier = list(dict.fromkeys(sources))
+    for s in frontier:
+        seen.add(s)
+    distance = 0
+    while frontier:
+        if any(is_target(s) for s in frontier):
+            return distance
+        frontier = _expand(frontier, neighbours, seen)
+        distance += 1
+    return None
+
+
+# Steps from the nearest source to every state, with -1 for the ones that can't be reached.
+def distances(sources, neighbours, n_states):
+    result = array('l', [-1]) * n_states
+    frontier = []
+    for s in sources:
+        if result[s] == -1:
+            result[s] = 0
+            frontier.append(s)
+    distance = 0
+    while frontier:
+        distance += 1
+        next_frontier = []
+        for state in frontier:
+            for n in neighbours(state):
+                if result[n] == -1:
+                    result[n] = distance
+                    next_frontier.append(n)
+        frontier = next_frontier
+    return result
+
+
+# Searches forward from source and backward from target a level at a time,
+# always growing the smaller side, until the two meet. It only keeps the
+# states seen from each end, which is far fewer than a one-way search visits.
+def bidirectional_path_length(source, target, neighbours, reverse_neighbours):
+    if source == target:
+        return 0
+    seen_forward, seen_backward = {source: 0}, {target: 0}
+    forward, backward = [source], [target]
+    steps_forward = steps_backward = 0
+    while forward and backward:
+        if len(forward) <= len(backward):
+            frontier, step_to, seen, other_seen, steps_forward = forward, neighbours, seen_forward, seen_backward, steps_forward + 1
+            steps = steps_forward
+        else:
+            frontier, step_to, seen, other_seen, steps_backward = backward, reverse_neighbours, seen_backward, seen_forward, steps_backward + 1
+            steps = steps_backward
+
+        next_frontier = []
+        for state in frontier:
+            for n in step_to(state):
+                if n not in seen:
+                    seen[n] = steps
+                    next_frontier.append(n)
+        meetings = [steps + other_seen[n] for n in next_frontier if n in other_seen]
+        if meetings:
+            return min(meetings)
+
+        if frontier is forward:
+            forward = next_frontier
+        else:
+            backward = next_frontier
+    return None
+
+
+# Cheapest cost from the sources to a target. `heuristic(state)` must never
+# overestimate the remaining cost; the default of 0 makes this plain Dijkstra.
+def astar(sources, neighbours, is_target, heuristic=lambda state: 0, n_states=None):
+    best = {}
+    queue = []
+    for s in sources:
+        best[s] = 0
+        heapq.heappush(queue, (heuristic(s), 0, s))
+    done = visited_states(n_states)
+    while queue:
+        _, cost, state = heapq.heappop(queue)
+        if state in done:
+            continue
+        if is_target(state):
+            return cost
+        done.add(state)
+        for n, step_cost in neighbours(state):
+            new_cost = cost + step_cost
+            if n not in done and new_cost < best.get(n, new_cost + 1):
+                best[n] = new_cost
+                heapq.heappush(queue, (new_cost + heuristic(n), new_cost, n))
+    return None
+
+
+def dijkstra(sources, neighbours, is_target, n_states=None):
+    return astar(sources, neighbours, is_target, n_states=n_states)
+
+
+#--------------------- tests -------------------------#
+
+# A 4x4 grid, states numbered 0-15 row by row, with walls at 5, 6 and 9.
+walls = {5, 6, 9}
+
+def grid_neighbours(state):
+    x, y = divmod(state, 4)
+    for nx, ny in ((x-1, y), (x+1, y), (x, y-1), (x, y+1)):
+        if 0 <= nx < 4 and 0 <= ny < 4 and nx*4 + ny not in walls:
+            yield nx*4 + ny
+
+def test_shortest_path_length():
+    assert shortest_path_length([0], grid_neighbours, lambda s: s == 10, n_states=16) == 6
+    assert shortest_path_length([0], grid_neighbours, lambda s: s == 10) == 6
+    assert shortest_path_length([0, 14], grid_neighbours, lambda s: s == 10, n_states=16) == 1
+    assert shortest_path_length([0], grid_neighbours, lambda s: s == 5, n_states=16) is None
+
+def test_distances():
+    d = distances([0], grid_neighbours, 16)
+    assert d[0] == 0
+    assert d[3] == 3
+    assert d[10] == 6
+    assert d[5] == -1
+
+def test_reachable():
+    states = list(reachable([0], grid_neighbours, 16))
+    assert states[0] == 0
+    assert len(states) == 13
+
+def test_bidirectional_path_length():
+    assert bidirectional_path_length(0, 10, grid_neighbours, grid_neighbours) == 6
+    assert bidirectional_path_length(0, 0, grid_neighbours, grid_neighbours) == 0
+    assert bidirectional_path_length(0, 10, grid_neighbours, lambda s: []) is None
+    for target in range(16):
+        if target not in walls:
+            assert bidirectional_path_length(0, target, grid_neighbours, grid_neighbours) == distances([0], grid_neighbours, 16)[target]
+
+def test_astar_and_dijkstra():
+    weighted = lambda s: ((n, 1) for n in grid_neighbours(s))
+    manhattan = lambda s: abs(s // 4 - 2) + abs(s % 4 - 2)
+    assert astar([0], weighted, lambda s: s == 10, manhattan, 16) == 6
+    assert dijkstra([0], weighted, lambda s: s == 10) == 6
+    # Going through 4 costs 10, so the long way round is cheaper.
+    costly = lambda s: ((n, 10 if n == 4 else 1) for n in grid_neighbours(s))
+    assert dijkstra([0], costly, lambda s: s == 12) == 9
+
+#-----------------------------------------------------#